@@ -1,20 +1,26 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
 import base64
-
-# ─── LOAD PROFILE IMAGE ───────────────────────────────────────────────────────
-def img_to_base64(path):
-    try:
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    except:
-        return None
-
-img_b64 = img_to_base64("assets/NANII.png")
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from salesdash import charts, config, export, materialize, topk
+from salesdash.cache import ResultCache, filter_key
+from salesdash.charts import fmt
+from salesdash.cube import (FILTERS, VIEWS, build_cube, compute_view, cube_columns, filter_cells, filter_options,
+                           month_span, slice_cube)
+from salesdash.datagen import generate_frame
+from salesdash.ingest import load_dataset
+from salesdash.live import DropDirWatcher, LiveDataset, SQLiteWatcher
+from salesdash.perf import PerfMonitor, json_log_sink, memory_report
+from salesdash.periods import (PERIOD_MEASURES, cell_totals, compare, delta, month_window, prefix_sums,
+                               previous_span, selection_span)
+from salesdash.rawview import SHOW_COLS, RawSorter
+from salesdash.schema import CUSTOMER, DATE, compact
+from salesdash.shared import load_or_publish
+from salesdash.sqlbackend import DuckDBBackend
+from salesdash.timeseries import GRANULARITIES, series_view
 
 st.set_page_config(
     page_title="Sales & Revenue Dashboard",
@@ -23,6 +29,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ─── PERF INSTRUMENTATION ─────────────────────────────────────────────────────
+@st.cache_resource
+def get_perf_monitor():
+    monitor = PerfMonitor()
+    if config.PERF_LOG:
+        monitor.add_sink(json_log_sink(config.PERF_LOG))
+    return monitor
+
+perf = get_perf_monitor()
+run  = perf.run()
+show_perf = config.PERF_PANEL or st.query_params.get("perf") == "1"
+
 # ─── GLOBAL STYLES ────────────────────────────────────────────────────────────
 st.markdown("""
 <style>
@@ -129,6 +147,7 @@ footer, #MainMenu { visibility: hidden; }
 }
 .kpi-delta.up   { color: var(--green); }
 .kpi-delta.down { color: var(--red); }
+.kpi-delta.flat { color: var(--muted); }
 .kpi-icon {
     font-size: 1.5rem;
     float: right;
@@ -194,67 +213,99 @@ footer, #MainMenu { visibility: hidden; }
 .prod-val { font-family: 'DM Mono', monospace; font-size: 0.78rem; color: var(--accent); font-weight: 600; }
 </style>
 """, unsafe_allow_html=True)
-
-# ─── GENERATE SUPERSTORE-STYLE DATASET ────────────────────────────────────────
-@st.cache_data
-def generate_data():
-    np.random.seed(42)
-    n = 1000
-
-    categories    = ["Technology", "Furniture", "Office Supplies"]
-    sub_cats = {
-        "Technology":      ["Phones","Laptops","Accessories","Printers"],
-        "Furniture":       ["Chairs","Tables","Bookcases","Storage"],
-        "Office Supplies": ["Paper","Binders","Art","Fasteners"],
-    }
-    regions   = ["West", "East", "Central", "South"]
-    segments  = ["Consumer", "Corporate", "Home Office"]
-    products  = [
-        "Apple MacBook Pro","Dell XPS 15","Canon ImageClass","Logitech MX Master",
-        "Herman Miller Chair","IKEA Kallax Shelf","Fellowes Shredder","Avery Binders",
-        "Samsung Galaxy Tab","Sony WH-1000XM5","HP LaserJet Pro","Staples Paper Ream",
-        "Microsoft Surface","Cisco IP Phone","Bush Bookcase","3M Post-it Notes",
-    ]
-
-    dates = pd.date_range("2022-01-01", "2024-12-31", periods=n)
-    cats  = np.random.choice(categories, n)
-
-    df = pd.DataFrame({
-        "Order Date": dates,
-        "Category":   cats,
-        "Sub-Category": [np.random.choice(sub_cats[c]) for c in cats],
-        "Region":     np.random.choice(regions, n),
-        "Segment":    np.random.choice(segments, n),
-        "Product":    np.random.choice(products, n),
-        "Sales":      np.random.uniform(50, 3000, n).round(2),
-        "Quantity":   np.random.randint(1, 10, n),
-        "Discount":   np.random.choice([0, 0.1, 0.2, 0.3, 0.4], n),
-    })
-    df["Profit"]  = (df["Sales"] * np.random.uniform(0.1, 0.4, n)).round(2)
-    df["Revenue"] = (df["Sales"] * df["Quantity"]).round(2)
-    df["Year"]    = df["Order Date"].dt.year
-    df["Month"]   = df["Order Date"].dt.to_period("M").astype(str)
-    df["MonthName"] = df["Order Date"].dt.strftime("%b %Y")
-    return df
-
-df = generate_data()
-
-# ─── PLOTLY TEMPLATE ──────────────────────────────────────────────────────────
-COLORS = ["#b8860b","#d4a017","#c8960c","#8b6914","#e8c547","#a07830"]
-
-def clean_fig(fig, height=340):
-    fig.update_layout(
-        height=height,
-        paper_bgcolor="#fffef5",
-        plot_bgcolor="#fffef5",
-        font=dict(family="DM Sans", size=12, color="#1a1609"),
-        margin=dict(l=10, r=10, t=36, b=10),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
-                    bgcolor="rgba(0,0,0,0)", font=dict(size=11)),
-        xaxis=dict(showgrid=False, showline=True, linecolor="#e8e0c8", tickfont=dict(size=11)),
-        yaxis=dict(showgrid=True,  gridcolor="#f5efd0", showline=False, tickfont=dict(size=11)),
-    )
-    return fig
+run.lap("styles")
+
+# ─── MATERIALIZED ROLLUPS (python -m salesdash.materialize; used while fresh) ─
+@st.cache_resource
+def get_materialized(base_version):
+    return materialize.load(config.MATERIALIZED, base_version) if config.MATERIALIZED else None
+
+# ─── DATASET (base load + cube + filter index, then append-only batches) ──────
+# appends copy the frame: each worker would trade the shared memory-mapped copy for a private one
+if config.SHARED_DIR and (config.APPEND_DIR or config.APPEND_SQLITE):
+    st.error("SALESDASH_SHARED_DIR cannot be combined with SALESDASH_APPEND_DIR / SALESDASH_APPEND_SQLITE.")
+    st.stop()
+
+# the SQLite source the watcher appends from changes (size, mtime) on every insert
+APPEND_TO_SOURCE = bool(config.SOURCE) and config.APPEND_SQLITE == config.SOURCE
+
+@st.cache_resource
+def get_base_version():
+    # pinned once per process: inserts reach the frame as batches, not as a reload
+    return materialize.dataset_version()
+
+@st.cache_resource(max_entries=1)
+def get_live_dataset(base_version):
+    watchers = []
+    if config.APPEND_DIR:
+        watchers.append(DropDirWatcher(config.APPEND_DIR, config.TABLE))
+    if config.APPEND_SQLITE:
+        # when the base export is that same database, only rows added later are new
+        watchers.append(SQLiteWatcher(config.APPEND_SQLITE, config.TABLE, from_end=APPEND_TO_SOURCE))
+    if APPEND_TO_SOURCE:
+        # base = rows up to the watcher's rowid mark; rows inserted during the load come in the first poll
+        read = watchers[-1].base
+    else:
+        read = lambda: load_dataset(config.SOURCE, config.TABLE) if config.SOURCE else generate_frame(config.ROWS, config.SEED)
+    load = (lambda: compact(read())) if config.COMPACT else read
+    if config.SHARED_DIR:
+        # one worker process loads and publishes; every worker maps it read-only
+        layout = "-compact" if config.COMPACT else ""
+        df, index = load_or_publish(config.SHARED_DIR, base_version + layout, load)
+    else:
+        df, index = load(), None
+    materialized = get_materialized(base_version)
+    live = LiveDataset(df, base_version, cube=materialized["cube"] if materialized else None, index=index,
+                       compact=config.COMPACT)
+    for watcher in watchers:
+        live.add_watcher(watcher)
+    return live
+
+# ─── SQL BACKEND (rows stay in Parquet; only per-chart GROUP BYs enter the process) ─
+@st.cache_resource
+def get_sql_backend(source):
+    return DuckDBBackend(source, config.DUCKDB_MEMORY)
+
+@st.cache_data(max_entries=2)
+def get_sql_options(_backend, version):
+    return _backend.filter_options()
+
+if config.BACKEND == "duckdb":
+    backend = get_sql_backend(config.SOURCE)
+    data_version = backend.version()
+    df, cube, index = None, None, None
+    options = get_sql_options(backend, data_version)
+    run.lap("options")
+else:
+    backend = None
+    base_version = get_base_version() if APPEND_TO_SOURCE else materialize.dataset_version()
+    live = get_live_dataset(base_version)
+    run.lap("load_data")
+
+    # new batches bump the version, so every version-keyed cache below moves on
+    live.poll(config.POLL_SECONDS)
+    df, cube, index, data_version = live.snapshot()
+    options = filter_options(cube)
+    run.lap("append")
+
+# ─── RESULT CACHE (LRU, byte-budgeted, shared by all sessions) ────────────────
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(config.CACHE_MB * 1024 * 1024)
+
+results = get_result_cache()
+
+# a fresh materialization already holds the unfiltered landing view
+materialized = get_materialized(data_version) if backend is None else None
+if materialized and filter_key({}, data_version) not in results:
+    results.put(filter_key({}, data_version), materialized["view"])
+
+# ─── ROLLUP POOL (opt-in: chart rollups run concurrently) ─────────────────────
+@st.cache_resource
+def get_pool(workers):
+    return ThreadPoolExecutor(workers, thread_name_prefix="salesdash-rollup") if workers else None
+
+pool = get_pool(config.WORKERS)
 
 # ─── SIDEBAR ──────────────────────────────────────────────────────────────────
 with st.sidebar:
@@ -266,44 +317,108 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    # multi-selects: nothing selected means "All"
     st.markdown('<div class="filter-label">Year</div>', unsafe_allow_html=True)
-    years = ["All"] + sorted(df["Year"].unique().tolist())
-    sel_year = st.selectbox("", years, label_visibility="collapsed")
+    sel_year = st.multiselect("", options["Year"], placeholder="All",
+                              label_visibility="collapsed")
 
     st.markdown('<div class="filter-label" style="margin-top:14px">Region</div>', unsafe_allow_html=True)
-    regions_list = ["All"] + sorted(df["Region"].unique().tolist())
-    sel_region = st.selectbox(" ", regions_list, label_visibility="collapsed")
+    sel_region = st.multiselect(" ", options["Region"], placeholder="All",
+                                label_visibility="collapsed")
 
     st.markdown('<div class="filter-label" style="margin-top:14px">Category</div>', unsafe_allow_html=True)
-    cats_list = ["All"] + sorted(df["Category"].unique().tolist())
-    sel_cat = st.selectbox("  ", cats_list, label_visibility="collapsed")
+    sel_cat = st.multiselect("  ", options["Category"], placeholder="All",
+                             label_visibility="collapsed")
 
     st.markdown('<div class="filter-label" style="margin-top:14px">Segment</div>', unsafe_allow_html=True)
-    segs_list = ["All"] + sorted(df["Segment"].unique().tolist())
-    sel_seg = st.selectbox("   ", segs_list, label_visibility="collapsed")
+    sel_seg = st.multiselect("   ", options["Segment"], placeholder="All",
+                             label_visibility="collapsed")
+
+    st.markdown('<div class="filter-label" style="margin-top:14px">Order Date</div>', unsafe_allow_html=True)
+    # "YYYY-MM" labels sort chronologically; the full span means no date filter
+    data_months = options["Month"]
+    first_day = pd.Period(data_months[0], "M").start_time.date()
+    last_day  = pd.Period(data_months[-1], "M").end_time.date()
+    sel_dates = st.slider("     ", first_day, last_day, (first_day, last_day), format="DD MMM YYYY",
+                          label_visibility="collapsed")
+
+    st.markdown('<div class="filter-label" style="margin-top:14px">Time Granularity</div>', unsafe_allow_html=True)
+    sel_gran = st.selectbox("    ", list(GRANULARITIES), label_visibility="collapsed")
 
     st.markdown("---")
     st.markdown('<div style="font-size:0.72rem;color:#6b7280;text-align:center;">Built with Streamlit + Plotly<br>Dataset: Superstore (Kaggle)</div>', unsafe_allow_html=True)
+run.lap("sidebar")
 
 # ─── FILTER DATA ──────────────────────────────────────────────────────────────
-fdf = df.copy()
-if sel_year   != "All": fdf = fdf[fdf["Year"]    == int(sel_year)]
-if sel_region != "All": fdf = fdf[fdf["Region"]  == sel_region]
-if sel_cat    != "All": fdf = fdf[fdf["Category"]== sel_cat]
-if sel_seg    != "All": fdf = fdf[fdf["Segment"] == sel_seg]
-
-# ─── KPI CALCULATIONS ─────────────────────────────────────────────────────────
-total_sales   = fdf["Sales"].sum()
-total_revenue = fdf["Revenue"].sum()
-total_profit  = fdf["Profit"].sum()
-profit_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
-total_orders  = len(fdf)
-avg_order_val = total_sales / total_orders if total_orders > 0 else 0
-
-def fmt(n):
-    if n >= 1_000_000: return f"${n/1_000_000:.2f}M"
-    if n >= 1_000:     return f"${n/1_000:.1f}K"
-    return f"${n:.0f}"
+filters = {col: val for col, val in zip(FILTERS, (sel_year, sel_region, sel_cat, sel_seg)) if val}
+if tuple(sel_dates) != (first_day, last_day):
+    filters[DATE] = tuple(pd.Timestamp(d) for d in sel_dates)
+
+def filtered_cells(filters):
+    # month-aligned ranges slice the cube; any other range re-aggregates just its own rows
+    rebuild = lambda: build_cube(index.take(df, filters, cube_columns(df)))
+    return filter_cells(cube, filters,
+                        lambda: results.get_or_compute(filter_key(filters, data_version) + ("cells",), rebuild))
+
+def filtered_view(filters, names):
+    # the SQL backend runs one GROUP BY per chart; in memory they are rolled up from the cube cells
+    return backend.view(filters, names) if backend else compute_view(filtered_cells(filters), names, pool)
+
+def filtered_totals(filters):
+    return cell_totals(backend.rollup(filters, [], PERIOD_MEASURES) if backend else filtered_cells(filters))
+
+# ─── KPI CALCULATIONS (served from the cube slice, not raw rows) ──────────────
+# cached frames are shared across sessions: copy before mutating any of them
+# lazy mode leaves Row 3's rollups to its fragment
+BELOW_FOLD = ["sub_category", "segment"]
+view_names = [v for v in VIEWS if v not in BELOW_FOLD] if config.LAZY else list(VIEWS)
+view = results.get_or_compute(filter_key(filters, data_version), lambda: filtered_view(filters, view_names))
+
+# months come from the cube; finer grains are bucketed from the filtered rows
+if sel_gran == "Month":
+    series = view
+else:
+    series = results.get_or_compute(
+        filter_key(filters, data_version) + (sel_gran,),
+        lambda: backend.series(filters, sel_gran) if backend else
+                series_view(index.take(df, filters, ["Order Date","Category","Revenue","Sales"]), sel_gran))
+# the helpers above are lazy: filtering is paid here, when the view and series resolve
+run.lap("filter")
+
+total_sales   = view["kpis"]["total_sales"]
+total_revenue = view["kpis"]["total_revenue"]
+total_profit  = view["kpis"]["total_profit"]
+profit_margin = view["kpis"]["profit_margin"]
+total_orders  = view["kpis"]["total_orders"]
+avg_order_val = view["kpis"]["avg_order_val"]
+
+# ─── PERIOD-OVER-PERIOD DELTAS (monthly prefix sums per non-period slice) ─────
+# the selected years / date range are compared with the window before them; the cards
+# show the selection's own totals, so with no period selected there is nothing to compare
+slice_filters = {k: v for k, v in filters.items() if k not in ("Year", DATE)}
+has_period = "Year" in filters or DATE in filters
+span = selection_span(filters.get("Year"), filters.get(DATE)) if has_period else None
+if span is None:
+    # all-time totals, or non-consecutive years: no single window to compare with
+    current, previous, prev_label = None, None, None
+elif month_span(span) is None:
+    # part-months: compare day for day with the equal-length range right before
+    prev_span = previous_span(span)
+    current = filtered_totals({**slice_filters, DATE: span})
+    previous = filtered_totals({**slice_filters, DATE: prev_span}) if prev_span[0].date() >= first_day else None
+    prev_label = f"{prev_span[0]:%d %b %Y} – {prev_span[1]:%d %b %Y}"
+else:
+    prefix = results.get_or_compute(filter_key(slice_filters, data_version) + ("prefix",),
+                                    lambda: prefix_sums(backend.monthly(slice_filters, data_months) if backend else
+                                                        slice_cube(cube, slice_filters)))
+    current, previous, prev_label = compare(prefix, *month_window(prefix, month_span(span)))
+
+def kpi_delta(measure):
+    text, direction = delta(current, previous, measure)
+    if previous is None:
+        return text, direction
+    return f"{text} vs {prev_label}", direction
+run.lap("kpis")
 
 # ─── PAGE HEADER ──────────────────────────────────────────────────────────────
 st.markdown("""
@@ -323,14 +438,14 @@ st.markdown("""
 k1, k2, k3, k4, k5 = st.columns(5)
 
 kpi_data = [
-    (k1, "Total Sales",    fmt(total_sales),    "💰", "+12.4% vs last period", "up"),
-    (k2, "Total Revenue",  fmt(total_revenue),  "📈", "+8.7% vs last period",  "up"),
-    (k3, "Profit",         fmt(total_profit),   "✅", "+5.2% vs last period",  "up"),
-    (k4, "Profit Margin",  f"{profit_margin:.1f}%", "🎯", "-1.1% vs last period", "down"),
-    (k5, "Total Orders",   f"{total_orders:,}", "🛒", "+18.3% vs last period", "up"),
+    (k1, "Total Sales",    fmt(total_sales),    "💰", *kpi_delta("Sales")),
+    (k2, "Total Revenue",  fmt(total_revenue),  "📈", *kpi_delta("Revenue")),
+    (k3, "Profit",         fmt(total_profit),   "✅", *kpi_delta("Profit")),
+    (k4, "Profit Margin",  f"{profit_margin:.1f}%", "🎯", *kpi_delta("Margin")),
+    (k5, "Total Orders",   f"{total_orders:,}", "🛒", *kpi_delta("Orders")),
 ]
 
-for col, label, val, icon, delta, direction in kpi_data:
+for col, label, val, icon, delta_text, direction in kpi_data:
     with col:
         st.markdown(f"""
         <div class="kpi-card">
@@ -338,12 +453,42 @@ for col, label, val, icon, delta, direction in kpi_data:
             <div class="kpi-label">{label}</div>
             <div class="kpi-value">{val}</div>
             <div class="kpi-delta {direction}">
-                {"▲" if direction=="up" else "▼"} {delta}
+                {"▲" if direction=="up" else "▼" if direction=="down" else "•"} {delta_text}
             </div>
         </div>
         """, unsafe_allow_html=True)
 
 st.write("")
+run.lap("kpi_row")
+
+# ─── FIGURES (cached per filter combination; rebuilt only when inputs change) ─
+def figure(name, build, *key):
+    return results.get_or_compute(filter_key(filters, data_version) + (name,) + key, build)
+
+# ─── TOP PRODUCTS & DISTINCT CUSTOMERS (exact, or one pass through sketches) ──
+def leaders():
+    has_customers = CUSTOMER in (backend.columns if backend else df)
+    sketch = config.TOPK == "sketch"
+    if sketch and backend is None:
+        # bounded memory whatever the catalogue size: SpaceSaving + HyperLogLog over the rows
+        cols = ["Product", "Sales"] + [CUSTOMER] * has_customers
+        heavy, hll = topk.sketch(export.frame_chunks(df, index.select(filters), cols), "Product", "Sales",
+                                 CUSTOMER if has_customers else None, config.TOPK_CAPACITY, config.HLL_PRECISION)
+        product = heavy.top(8, "Product", "Sales")
+        customers = hll.count() if hll else None
+        note = f"≈{customers:,} distinct customers (±{hll.relative_error:.1%})" if hll else ""
+        if product["Error"].max() > 0:
+            note += f" · product sales overstated by ≤ {fmt(product['Error'].max())}"
+        return {"product": product, "customers": customers, "customers_note": note}
+    # the product rollup is already exact in the cube; the engine reduces the HyperLogLog registers
+    customers = None
+    if has_customers and backend is None:
+        customers = int(index.take(df, filters, [CUSTOMER])[CUSTOMER].nunique())
+    elif has_customers:
+        customers = (backend.hyperloglog(filters, CUSTOMER, config.HLL_PRECISION).count() if sketch else
+                     backend.distinct(filters, CUSTOMER))
+    note = f"{'≈' * sketch}{customers:,} distinct customers" if customers is not None else ""
+    return {"product": view["product"], "customers": customers, "customers_note": note}
 
 # ─── ROW 1 : Revenue Over Time + Sales by Category ────────────────────────────
 r1c1, r1c2 = st.columns((3, 2))
@@ -351,45 +496,14 @@ r1c1, r1c2 = st.columns((3, 2))
 with r1c1:
     st.markdown('<div class="sec-header">Revenue Over Time</div>', unsafe_allow_html=True)
     st.write("")
-    monthly = fdf.groupby("Month").agg(Revenue=("Revenue","sum"), Sales=("Sales","sum")).reset_index()
-    monthly = monthly.sort_values("Month")
-
-    fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(
-        x=monthly["Month"], y=monthly["Revenue"],
-        name="Revenue", mode="lines+markers",
-        line=dict(color="#b8860b", width=2.5),
-        marker=dict(size=5),
-        fill="tozeroy", fillcolor="rgba(184,134,11,0.07)"
-    ))
-    fig1.add_trace(go.Scatter(
-        x=monthly["Month"], y=monthly["Sales"],
-        name="Sales", mode="lines",
-        line=dict(color="#d4a017", width=2, dash="dot"),
-    ))
-    # show every 4th label to avoid crowding
-    tick_vals = monthly["Month"].iloc[::4].tolist()
-    fig1.update_xaxes(tickvals=tick_vals, tickangle=-30, tickfont=dict(size=10))
-    st.plotly_chart(clean_fig(fig1, 320), use_container_width=True)
+    st.plotly_chart(figure("fig1", lambda: charts.revenue_over_time(series["monthly"], sel_gran), sel_gran),
+                    use_container_width=True)
 
 with r1c2:
     st.markdown('<div class="sec-header">Sales by Category</div>', unsafe_allow_html=True)
     st.write("")
-    cat_sales = fdf.groupby("Category")["Sales"].sum().reset_index().sort_values("Sales", ascending=True)
-    fig2 = go.Figure(go.Bar(
-        x=cat_sales["Sales"], y=cat_sales["Category"],
-        orientation="h",
-        marker=dict(
-            color=COLORS[:len(cat_sales)],
-            line=dict(color="rgba(0,0,0,0)", width=0)
-        ),
-        text=[fmt(v) for v in cat_sales["Sales"]],
-        textposition="outside",
-        textfont=dict(size=11),
-    ))
-    fig2.update_xaxes(showgrid=False, showticklabels=False)
-    fig2.update_yaxes(showgrid=False)
-    st.plotly_chart(clean_fig(fig2, 320), use_container_width=True)
+    st.plotly_chart(figure("fig2", lambda: charts.sales_by_category(view["category"])), use_container_width=True)
+run.lap("row1")
 
 # ─── ROW 2 : Sales by Region + Monthly Trends (sub-cat) + Top Products ────────
 r2c1, r2c2, r2c3 = st.columns((1.2, 1.8, 1.8))
@@ -397,96 +511,125 @@ r2c1, r2c2, r2c3 = st.columns((1.2, 1.8, 1.8))
 with r2c1:
     st.markdown('<div class="sec-header">Sales by Region</div>', unsafe_allow_html=True)
     st.write("")
-    reg_sales = fdf.groupby("Region")["Sales"].sum().reset_index()
-    fig3 = go.Figure(go.Pie(
-        labels=reg_sales["Region"],
-        values=reg_sales["Sales"],
-        hole=0.52,
-        marker=dict(colors=COLORS),
-        textinfo="label+percent",
-        textfont=dict(size=11),
-        hovertemplate="<b>%{label}</b><br>Sales: $%{value:,.0f}<extra></extra>"
-    ))
-    fig3.add_annotation(text=f"<b>{fmt(reg_sales['Sales'].sum())}</b>",
-                        x=0.5, y=0.5, font_size=13, showarrow=False)
-    st.plotly_chart(clean_fig(fig3, 320), use_container_width=True)
+    st.plotly_chart(figure("fig3", lambda: charts.sales_by_region(view["region"])), use_container_width=True)
 
 with r2c2:
     st.markdown('<div class="sec-header">Monthly Trends by Category</div>', unsafe_allow_html=True)
     st.write("")
-    mt = fdf.groupby(["Month","Category"])["Sales"].sum().reset_index().sort_values("Month")
-    fig4 = px.line(mt, x="Month", y="Sales", color="Category",
-                   color_discrete_sequence=COLORS,
-                   markers=True)
-    fig4.update_traces(marker_size=4, line_width=2)
-    tick_vals2 = mt["Month"].unique()[::4].tolist()
-    fig4.update_xaxes(tickvals=tick_vals2, tickangle=-30, tickfont=dict(size=10))
-    st.plotly_chart(clean_fig(fig4, 320), use_container_width=True)
+    st.plotly_chart(figure("fig4", lambda: charts.category_trends(series["month_category"], sel_gran), sel_gran),
+                    use_container_width=True)
 
 with r2c3:
     st.markdown('<div class="sec-header">Top Products by Sales</div>', unsafe_allow_html=True)
     st.write("")
-    top_prods = fdf.groupby("Product")["Sales"].sum().reset_index().sort_values("Sales", ascending=False).head(8)
-    max_val   = top_prods["Sales"].max()
-    rows_html = ""
-    for idx, (_, row) in enumerate(top_prods.iterrows()):
-        pct   = int(row["Sales"] / max_val * 100)
-        rows_html += f"""
-        <div class="prod-row">
-            <span class="prod-rank">#{idx+1}</span>
-            <span class="prod-name">{row['Product'][:22]}{'…' if len(row['Product'])>22 else ''}</span>
-            <div class="prod-bar-wrap"><div class="prod-bar" style="width:{pct}%"></div></div>
-            <span class="prod-val">{fmt(row['Sales'])}</span>
-        </div>"""
-    st.markdown(f'<div class="chart-card" style="padding:16px 20px">{rows_html}</div>', unsafe_allow_html=True)
+    top = results.get_or_compute(filter_key(filters, data_version) + ("leaders", config.TOPK), leaders)
+    st.markdown(charts.top_products_html(top["product"]), unsafe_allow_html=True)
+    if top["customers_note"]:
+        st.caption(f"👥 {top['customers_note']}")
+run.lap("row2")
 
 # ─── ROW 3 : Profit Margin by Sub-Category + Sales by Segment ─────────────────
-r3c1, r3c2 = st.columns((2, 1))
-
-with r3c1:
-    st.markdown('<div class="sec-header">Profit Margin by Sub-Category</div>', unsafe_allow_html=True)
-    st.write("")
-    sub_pm = fdf.groupby("Sub-Category").agg(Sales=("Sales","sum"), Profit=("Profit","sum")).reset_index()
-    sub_pm["Margin%"] = (sub_pm["Profit"] / sub_pm["Sales"] * 100).round(1)
-    sub_pm = sub_pm.sort_values("Margin%", ascending=False)
-
-    colors_pm = ["#059669" if v >= 20 else "#d97706" if v >= 10 else "#dc2626" for v in sub_pm["Margin%"]]
-    fig5 = go.Figure(go.Bar(
-        x=sub_pm["Sub-Category"], y=sub_pm["Margin%"],
-        marker_color=colors_pm,
-        text=[f"{v}%" for v in sub_pm["Margin%"]],
-        textposition="outside",
-        textfont=dict(size=10),
-    ))
-    fig5.add_hline(y=20, line_dash="dash", line_color="#b8860b", annotation_text="Target 20%",
-                   annotation_font_size=10, annotation_font_color="#b8860b")
-    fig5.update_yaxes(title_text="Margin %", ticksuffix="%")
-    st.plotly_chart(clean_fig(fig5, 300), use_container_width=True)
-
-with r3c2:
-    st.markdown('<div class="sec-header">Revenue by Segment</div>', unsafe_allow_html=True)
-    st.write("")
-    seg_rev = fdf.groupby("Segment")["Revenue"].sum().reset_index()
-    fig6 = go.Figure(go.Pie(
-        labels=seg_rev["Segment"],
-        values=seg_rev["Revenue"],
-        hole=0.45,
-        marker=dict(colors=["#b8860b","#d4a017","#8b6914"]),
-        textinfo="label+percent",
-        textfont=dict(size=11),
-    ))
-    st.plotly_chart(clean_fig(fig6, 300), use_container_width=True)
+def render_row3():
+    row3 = view if "sub_category" in view else results.get_or_compute(
+        filter_key(filters, data_version) + ("row3",),
+        lambda: filtered_view(filters, BELOW_FOLD))
+    r3c1, r3c2 = st.columns((2, 1))
+
+    with r3c1:
+        st.markdown('<div class="sec-header">Profit Margin by Sub-Category</div>', unsafe_allow_html=True)
+        st.write("")
+        st.plotly_chart(figure("fig5", lambda: charts.subcategory_margin(row3["sub_category"])), use_container_width=True)
+
+    with r3c2:
+        st.markdown('<div class="sec-header">Revenue by Segment</div>', unsafe_allow_html=True)
+        st.write("")
+        st.plotly_chart(figure("fig6", lambda: charts.revenue_by_segment(row3["segment"])), use_container_width=True)
 
 # ─── ROW 4 : Raw Data Table ────────────────────────────────────────────────────
-with st.expander("📋 View Raw Data", expanded=False):
-    show_cols = ["Order Date","Category","Sub-Category","Region","Segment","Product","Sales","Revenue","Profit","Quantity"]
-    styled = fdf[show_cols].sort_values("Order Date", ascending=False).head(200)
-    styled["Order Date"] = styled["Order Date"].dt.strftime("%d %b %Y")
-    st.dataframe(styled, use_container_width=True, height=320)
-    st.caption(f"Showing top 200 of {len(fdf):,} filtered records")
-
-# ─── FOOTER ───────────────────────────────────────────────────────────────────
-st.markdown(f"""
+@st.cache_resource(max_entries=2)
+def get_raw_sorter(_df, version):
+    return RawSorter(_df)
+
+def render_raw_data():
+    # only the visible page is gathered, formatted and sent to the browser
+    n_rows = total_orders
+
+    c1, c2, c3, c4 = st.columns((2, 1, 1, 1))
+    sort_col  = c1.selectbox("Sort by", SHOW_COLS, key="raw_sort")
+    ascending = c2.radio("Order", ["Desc", "Asc"], horizontal=True, key="raw_dir") == "Asc"
+    page_size = c3.selectbox("Rows / page", [50, 200, 1000], index=1, key="raw_size")
+    n_pages   = max(1, -(-n_rows // page_size))
+    page      = c4.number_input(f"Page (of {n_pages:,})", 1, n_pages, 1, key="raw_page") - 1
+
+    if backend:
+        styled = backend.page(filters, sort_col, ascending, page, page_size)
+    else:
+        styled = get_raw_sorter(df, data_version).page(index.select(filters), sort_col, ascending, page, page_size)
+    st.dataframe(styled, use_container_width=True, height=320, hide_index=True)
+    first = page * page_size + 1 if n_rows else 0
+    st.caption(f"Showing {first:,}–{first + len(styled) - 1 if n_rows else 0:,} of {n_rows:,} filtered records")
+
+    # the full selection is encoded only on click, on a separate thread, chunk by chunk;
+    # Streamlit then holds the whole file in memory, hence the row cap
+    e1, e2 = st.columns((1, 3))
+    export_fmt = e1.selectbox("Export format", list(export.FORMATS), key="export_fmt")
+    ext, mime  = export.FORMATS[export_fmt]
+    too_big    = n_rows > config.EXPORT_MAX_ROWS
+    e2.download_button(f"⬇ Download {n_rows:,} filtered records", on_click="ignore",
+                       data=partial(export.selection_file, df, index, backend, filters, export_fmt),
+                       file_name=f"orders{ext}", mime=mime, disabled=too_big)
+    if too_big:
+        e2.caption(f"Downloads are limited to {config.EXPORT_MAX_ROWS:,} records: narrow the filters.")
+
+if config.LAZY:
+    # below-the-fold rows sit behind toggles inside fragments: nothing is
+    # aggregated or built until shown, and flipping a toggle reruns only its fragment
+    @st.fragment
+    def row3_fragment():
+        if st.toggle("Show profit margin & segment breakdown", key="show_row3"):
+            render_row3()
+
+    @st.fragment
+    def raw_data_fragment():
+        if st.toggle("📋 View Raw Data", key="show_raw"):
+            render_raw_data()
+
+    row3_fragment()
+    run.lap("row3")
+    raw_data_fragment()
+    run.lap("row4")
+else:
+    render_row3()
+    run.lap("row3")
+    with st.expander("📋 View Raw Data", expanded=False):
+        render_raw_data()
+    run.lap("row4")
+
+# ─── LOAD PROFILE IMAGE (encoded once per process) ────────────────────────────
+@st.cache_resource(show_spinner=False)
+def img_to_base64(path, size=None):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if size:
+        # the avatar renders at 52 px: ship a small copy instead of the full-size PNG
+        from PIL import Image
+        img = Image.open(io.BytesIO(data))
+        scale = size / min(img.size)
+        if scale < 1:
+            img = img.resize((round(img.width * scale), round(img.height * scale)), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.save(buf, "PNG", optimize=True)
+            data = buf.getvalue()
+    return base64.b64encode(data).decode()
+
+# ─── FOOTER (markup built once per process) ───────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def footer_html():
+    img_b64 = img_to_base64("assets/NANII.png", 156)
+    return f"""
 <style>
 .footer {{
     margin-top: 48px;
@@ -573,4 +716,28 @@ st.markdown(f"""
         Built with Streamlit &amp; Plotly &nbsp;·&nbsp; Dataset: Superstore (Kaggle) &nbsp;·&nbsp; © 2025 Sriram Sai Laggisetti
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(footer_html(), unsafe_allow_html=True)
+run.lap("footer")
+
+# ─── PERF PANEL (opt-in: ?perf=1 or SALESDASH_PERF_PANEL=1) ────────────────────
+last_run = run.finish(filters=filter_key(filters, data_version), granularity=sel_gran,
+                      rows=options["rows"], filtered_rows=total_orders)
+if show_perf:
+    with st.sidebar:
+        with st.expander("⏱ Performance", expanded=True):
+            st.caption(f"Last rerun: {last_run['total_ms']:.1f} ms · rolling window of {perf.window} runs")
+            st.dataframe(pd.DataFrame(perf.summary()), hide_index=True, use_container_width=True)
+            stats = results.stats()
+            st.caption(f"Result cache: {stats['entries']} entries · {stats['bytes']/2**20:.1f} / "
+                       f"{stats['max_bytes']/2**20:.0f} MB · hit rate {stats['hit_rate']:.0%} · "
+                       f"{stats['evictions']} evictions · {stats['executed']} computed, "
+                       f"{stats['coalesced']} coalesced onto an in-flight run")
+            if df is not None:
+                memory = pd.DataFrame(memory_report(df, index=index, cube=cube, results=results,
+                                                    raw_sorter=get_raw_sorter(df, data_version)))
+                total = memory.iloc[-1]
+                st.caption(f"Memory ({'compact' if config.COMPACT else 'default'} layout): "
+                           f"{total['mb']:,.1f} MB · {total['bytes_per_row']:.0f} B/row")
+                st.dataframe(memory, hide_index=True, use_container_width=True)
@@ -0,0 +1,18 @@
+"""Headless data pipeline behind the Sales & Revenue dashboard."""
+import importlib
+
+# re-exported lazily: importing a submodule here would make ``python -m salesdash.<module>``
+# run a module that is already in sys.modules (runpy RuntimeWarning)
+_EXPORTS = {
+    "generate_frame": "datagen", "iter_chunks": "datagen", "write_fixture": "datagen",
+    "load_dataset": "ingest", "register_loader": "ingest", "source_version": "ingest",
+    "LiveDataset": "live",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
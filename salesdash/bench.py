@@ -0,0 +1,267 @@
+"""Headless benchmark of the dashboard data pipeline.
+
+    python -m salesdash.bench --rows 1000,1000000 --out bench.json
+    python -m salesdash.bench --rows 1000,1000000 --app      # + app cold start / warm rerun
+    python -m salesdash.bench --rows 1000000 --compact       # pipeline on the compact frame
+
+Every stage is timed for each dataset size and each filter combination in
+:data:`FILTER_MATRIX`, recording wall time, peak RSS and Python/NumPy heap
+allocations (via ``tracemalloc``). Results are printed as a table and written
+as JSON so runs can be diffed between releases.
+
+``--app`` also runs the Streamlit script itself under ``AppTest`` in a fresh
+interpreter per size: ``app_cold`` is imports plus the first full run (cache
+fills included), ``app_warm`` the median of the reruns that follow.
+
+Each size also gets ``memory`` records: the resident bytes of the frame,
+filter index and cube in the layout under test, next to the estimated size of
+the same rows held as object strings (the layout before categoricals).
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from salesdash import charts
+from salesdash.cube import build_cube, compute_view, cube_columns, filter_cells, kpis
+from salesdash.datagen import generate_frame
+from salesdash.index import FilterIndex
+from salesdash.perf import memory_report
+from salesdash.schema import DATE, column, compact as compact_frame
+from salesdash.timeseries import series_view
+
+SIZES = [1_000, 100_000, 1_000_000, 10_000_000, 50_000_000]
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "SalesDashboard.py")
+
+FILTER_MATRIX = [
+    {},
+    {"Year": 2023},
+    {"Region": "West"},
+    {"Year": 2024, "Category": "Technology"},
+    {"Region": ["East", "West"], "Segment": "Consumer"},
+    {"Year": 2022, "Region": "South", "Category": "Furniture", "Segment": "Corporate"},
+    {DATE: (pd.Timestamp("2023-03-01"), pd.Timestamp("2023-08-31")), "Region": ["East", "West"]},
+    {DATE: (pd.Timestamp("2023-03-10"), pd.Timestamp("2023-03-24")), "Category": ["Technology", "Furniture"]},
+]
+
+
+# ─── MEASUREMENT ──────────────────────────────────────────────────────────────
+def _rss_peak_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _reset_rss_peak():
+    # Linux only: lets each stage report its own high-water mark
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+class Recorder:
+    def __init__(self, trace_allocs=True):
+        self.trace_allocs = trace_allocs
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, **labels):
+        _reset_rss_peak()
+        if self.trace_allocs:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            rec = {"stage": name, **labels, "wall_s": round(wall, 6), "peak_rss_mb": round(_rss_peak_kb() / 1024, 1)}
+            if self.trace_allocs:
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                rec["alloc_peak_mb"] = round(peak / 2**20, 3)
+                rec["alloc_net_mb"]  = round(current / 2**20, 3)
+            self.records.append(rec)
+
+
+def _label(filters):
+    return ",".join(f"{k}={v[0]:%Y-%m-%d}..{v[1]:%Y-%m-%d}" if k == DATE else f"{k}={v}"
+                    for k, v in filters.items()) or "All"
+
+
+# ─── STAGES ───────────────────────────────────────────────────────────────────
+def _strings_bytes(df):
+    """Estimated size of ``df`` with its dimensions and time labels held as Python strings."""
+    total = 0
+    for col in dict.fromkeys([*df.columns, "Year", "Month", "MonthName"]):
+        values = column(df, col)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # one 8-byte pointer plus one string object per row
+            sizes = np.array([sys.getsizeof(str(c)) for c in values.cat.categories])
+            total += 8 * len(values) + int(sizes[values.cat.codes.to_numpy()].sum())
+        elif values.dtype.kind in "iuf":
+            total += 8 * len(values)
+        else:
+            total += int(values.memory_usage(deep=True, index=False))
+    return total
+
+
+def record_memory(rec, n, df, index, cube, layout):
+    report  = {r["part"]: r for r in memory_report(df, index=index, cube=cube)}
+    strings = _strings_bytes(df)
+    rec.records.append({"stage": "memory", "rows": n, "layout": "strings (est.)",
+                        "frame_mb": round(strings / 2**20, 2), "bytes_per_row": round(strings / max(n, 1), 1)})
+    rec.records.append({"stage": "memory", "rows": n, "layout": layout,
+                        "frame_mb": report["frame"]["mb"], "index_mb": report["index"]["mb"],
+                        "cube_mb": report["cube"]["mb"], "bytes_per_row": report["frame"]["bytes_per_row"]})
+
+
+def run_size(rec, n, filter_matrix=FILTER_MATRIX, granularity="Day", pool=None, compact=False):
+    with rec.stage("generate", rows=n):
+        df = generate_frame(n)
+    if compact:
+        with rec.stage("compact", rows=n):
+            df = compact_frame(df)
+    with rec.stage("build_cube", rows=n):
+        cube = build_cube(df)
+    with rec.stage("build_index", rows=n):
+        index = FilterIndex(df)
+    record_memory(rec, n, df, index, cube, "compact" if compact else "default")
+
+    for filters in filter_matrix:
+        labels = {"rows": n, "filters": _label(filters)}
+        with rec.stage("filter", **labels):
+            rows = index.take(df, filters)
+        with rec.stage("slice_cube", **labels):
+            cells = filter_cells(cube, filters, lambda: build_cube(index.take(df, filters, cube_columns(df))))
+        with rec.stage("kpis", **labels):
+            kpis(cells)
+        with rec.stage("aggregations", **labels):
+            view = compute_view(cells, pool=pool)
+        with rec.stage("series", granularity=granularity, **labels):
+            series = series_view(rows, granularity)
+        with rec.stage("figures", **labels):
+            figs = charts.build_figures(view)
+            figs.update(fig1=charts.revenue_over_time(series["monthly"], granularity),
+                        fig4=charts.category_trends(series["month_category"], granularity))
+        with rec.stage("serialize", **labels):
+            payload = sum(len(f.to_json()) for k, f in figs.items() if k.startswith("fig"))
+        rec.records[-1]["payload_bytes"] = payload
+        del rows, cells, view, series, figs
+    del df, cube, index
+
+
+# ─── APP START-UP ─────────────────────────────────────────────────────────────
+def _probe_app(app, reruns):
+    """Time one cold run and ``reruns`` warm reruns of ``app`` in this (fresh) interpreter."""
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=600).run()
+    cold = time.perf_counter() - t0
+    warm = []
+    for _ in range(reruns):
+        t = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - t)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {"cold_s": cold, "warm_s": warm}
+
+
+def run_app(rec, n, app=APP, reruns=5):
+    env = dict(os.environ, SALESDASH_ROWS=str(n))
+    out = subprocess.run(
+        [sys.executable, "-m", "salesdash.bench", "--probe-app", app, "--reruns", str(reruns)],
+        env=env, cwd=os.path.dirname(app), capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(out.stdout.strip().splitlines()[-1])
+    rec.records.append({"stage": "app_cold", "rows": n, "wall_s": round(timings["cold_s"], 6)})
+    rec.records.append({"stage": "app_warm", "rows": n, "wall_s": round(float(np.median(timings["warm_s"])), 6),
+                        "reruns": reruns})
+
+
+def run(sizes=SIZES, filter_matrix=FILTER_MATRIX, trace_allocs=True, workers=0, app=False, compact=False):
+    rec = Recorder(trace_allocs)
+    pool = ThreadPoolExecutor(workers) if workers else None
+    for n in sizes:
+        if app:
+            run_app(rec, n)
+        run_size(rec, n, filter_matrix, pool=pool, compact=compact)
+    if pool:
+        pool.shutdown()
+    return {
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "created":  time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "workers":  workers,
+        "compact":  compact,
+        "results":  rec.records,
+    }
+
+
+def _print_table(records):
+    cols = ["stage", "rows", "filters", "wall_s", "peak_rss_mb", "alloc_peak_mb"]
+    print("  ".join(f"{c:>14}" for c in cols))
+    for r in records:
+        if r["stage"] != "memory":
+            print("  ".join(f"{str(r.get(c, '')):>14}" for c in cols))
+    cols = ["rows", "layout", "frame_mb", "bytes_per_row", "index_mb", "cube_mb"]
+    print()
+    print("  ".join(f"{c:>14}" for c in cols))
+    for r in records:
+        if r["stage"] == "memory":
+            print("  ".join(f"{str(r.get(c, '')):>14}" for c in cols))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard data pipeline.")
+    parser.add_argument("--rows", default=",".join(map(str, SIZES)),
+                        help="comma-separated dataset sizes (default: 1K..50M)")
+    parser.add_argument("--out", help="write JSON results to this file")
+    parser.add_argument("--no-alloc", action="store_true",
+                        help="skip tracemalloc (much faster on large sizes)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="run the chart rollups on a thread pool of this size")
+    parser.add_argument("--app", action="store_true",
+                        help="also time the Streamlit app's cold start and warm reruns")
+    parser.add_argument("--compact", action="store_true",
+                        help="run on the compact frame (float32 measures, narrow ints, derived time labels)")
+    parser.add_argument("--reruns", type=int, default=5, help=argparse.SUPPRESS)
+    parser.add_argument("--probe-app", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe_app:
+        # child process of run_app: the JSON line is its only stdout
+        print(json.dumps(_probe_app(args.probe_app, args.reruns)))
+        return
+
+    sizes = [int(float(n)) for n in args.rows.split(",")]
+    report = run(sizes, trace_allocs=not args.no_alloc, workers=args.workers, app=args.app, compact=args.compact)
+    _print_table(report["results"])
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
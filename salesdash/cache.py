@@ -0,0 +1,138 @@
+"""Byte-budgeted LRU cache for per-filter-combination results.
+
+One instance is shared by every Streamlit session in the process, so users
+flipping back to a filter combination (or opening the same one) reuse the
+KPIs and chart frames computed earlier. Lookups are single-flight: when
+several sessions miss on the same key at once (everyone opening the default
+view at 9am), one computes and the rest wait for its result.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from salesdash.cube import FILTERS
+from salesdash.schema import DATE
+
+
+def filter_key(filters, version):
+    """Hashable ``(year, region, category, segment, date range, version)`` cache key."""
+    def norm(v):
+        return tuple(sorted(v)) if isinstance(v, (list, tuple, set, frozenset)) else v
+    dates = filters.get(DATE)
+    dates = "All" if dates is None else tuple(str(pd.Timestamp(t).date()) for t in dates)
+    return tuple(norm(filters.get(c, "All")) for c in FILTERS) + (dates, version)
+
+
+def sizeof(obj):
+    """Approximate resident bytes of a cached result."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(sizeof(v) for v in obj)
+    if hasattr(obj, "to_plotly_json"):
+        return sizeof(obj.to_plotly_json())
+    return sys.getsizeof(obj)
+
+
+class ResultCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes    = 0
+        self.hits = self.misses = self.evictions = 0
+        self.executed = self.coalesced = 0
+        self._items   = OrderedDict()   # key → (value, size), oldest first
+        self._flights = {}              # key → Future of the computation in progress
+        self._lock    = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._items.pop(key)[1]
+            if size > self.max_bytes:
+                return value   # would evict everything else; serve uncached
+            self._items[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, old) = self._items.popitem(last=False)
+                self.nbytes -= old
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, fn):
+        """Cached value for ``key``, else ``fn()`` run once however many callers miss together."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        with self._lock:
+            if key in self._items:
+                # another caller's computation finished between the lookup and the lock
+                self.coalesced += 1
+                return self._items[key][0]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+        try:
+            value = self.put(key, fn())
+            flight.set_result(value)
+        except BaseException as exc:
+            # waiters see the same failure instead of hanging
+            flight.set_exception(exc)
+            raise
+        finally:
+            # only after put(): a newcomer finds either the value or the flight
+            with self._lock:
+                del self._flights[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries":   len(self._items),
+                "bytes":     self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "evictions": self.evictions,
+                "hit_rate":  self.hits / lookups if lookups else 0.0,
+                "executed":  self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+            }
@@ -0,0 +1,214 @@
+"""Plotly figure builders for the dashboard charts.
+
+Each builder takes the aggregated frames from :func:`salesdash.cube.compute_view`
+(or :func:`salesdash.timeseries.series_view`) and returns a finished figure,
+so the same code runs inside Streamlit and in the headless benchmarks.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from salesdash import config
+from salesdash.timeseries import thin
+from salesdash.topk import top_k
+
+# ─── PLOTLY TEMPLATE ──────────────────────────────────────────────────────────
+COLORS = ["#b8860b","#d4a017","#c8960c","#8b6914","#e8c547","#a07830"]
+
+# the parts of the stock template that bar / pie / line charts read; the
+# rest (colorscales, 3D, polar, geo…) was ~80% of every figure's JSON
+_TEMPLATE_LAYOUT = ["autotypenumbers", "colorway", "font", "hovermode", "hoverlabel",
+                    "xaxis", "yaxis", "shapedefaults", "annotationdefaults", "title"]
+_TEMPLATE_TRACES = ["bar", "pie", "scatter", "scattergl"]
+
+
+def _compact_template():
+    base = pio.templates["plotly"]
+    layout = {k: v for k, v in base.layout.to_plotly_json().items() if k in _TEMPLATE_LAYOUT}
+    data   = {k: v for k, v in base.data.to_plotly_json().items() if k in _TEMPLATE_TRACES}
+    template = go.layout.Template(layout=layout, data=data)
+    template.layout.update(
+        paper_bgcolor="#fffef5",
+        plot_bgcolor="#fffef5",
+        font=dict(family="DM Sans", size=12, color="#1a1609"),
+        margin=dict(l=10, r=10, t=36, b=10),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
+                    bgcolor="rgba(0,0,0,0)", font=dict(size=11)),
+    )
+    return template
+
+
+# built once per process and shared by every figure
+TEMPLATE = _compact_template()
+
+
+def _f64(values):
+    """Trace values as a float64 array: Plotly 6 serializes it as a base64 typed array.
+
+    float64, not float32: regional totals in the billions would be off by
+    up to hundreds of dollars in the ``$,.0f`` hover labels.
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def clean_fig(fig, height=340):
+    # static styling lives in TEMPLATE; axes stay per figure because they
+    # deliberately override what the builders set
+    fig.update_layout(
+        template=TEMPLATE,
+        height=height,
+        xaxis=dict(showgrid=False, showline=True, linecolor="#e8e0c8", tickfont=dict(size=11)),
+        yaxis=dict(showgrid=True,  gridcolor="#f5efd0", showline=False, tickfont=dict(size=11)),
+    )
+    return fig
+
+
+def fmt(n):
+    if n >= 1_000_000: return f"${n/1_000_000:.2f}M"
+    if n >= 1_000:     return f"${n/1_000:.1f}K"
+    return f"${n:.0f}"
+
+
+def _time_axis(fig, x_values, gran):
+    if gran == "Month":
+        # show every 4th label to avoid crowding
+        fig.update_xaxes(tickvals=list(x_values)[::4], tickangle=-30, tickfont=dict(size=10))
+    else:
+        fig.update_xaxes(tickangle=-30, tickfont=dict(size=10))
+
+
+# ─── ROW 1 ────────────────────────────────────────────────────────────────────
+def revenue_over_time(monthly, gran="Month"):
+    monthly = monthly.sort_values(gran)
+    rev_pts = thin(monthly, gran, "Revenue", config.MAX_POINTS, config.DOWNSAMPLE)
+    sal_pts = thin(monthly, gran, "Sales",   config.MAX_POINTS, config.DOWNSAMPLE)
+    # WebGL keeps the browser responsive once the trace gets long
+    Trace = go.Scattergl if len(rev_pts) > config.WEBGL_POINTS else go.Scatter
+
+    fig = go.Figure()
+    fig.add_trace(Trace(
+        x=rev_pts[gran], y=_f64(rev_pts["Revenue"]),
+        name="Revenue", mode="lines+markers",
+        line=dict(color="#b8860b", width=2.5),
+        marker=dict(size=5),
+        fill="tozeroy", fillcolor="rgba(184,134,11,0.07)"
+    ))
+    fig.add_trace(Trace(
+        x=sal_pts[gran], y=_f64(sal_pts["Sales"]),
+        name="Sales", mode="lines",
+        line=dict(color="#d4a017", width=2, dash="dot"),
+    ))
+    _time_axis(fig, monthly[gran].unique(), gran)
+    return clean_fig(fig, 320)
+
+
+def sales_by_category(cat_sales):
+    cat_sales = cat_sales.sort_values("Sales", ascending=True)
+    fig = go.Figure(go.Bar(
+        x=_f64(cat_sales["Sales"]), y=cat_sales["Category"],
+        orientation="h",
+        marker=dict(
+            color=COLORS[:len(cat_sales)],
+            line=dict(color="rgba(0,0,0,0)", width=0)
+        ),
+        text=[fmt(v) for v in cat_sales["Sales"]],
+        textposition="outside",
+        textfont=dict(size=11),
+    ))
+    fig.update_xaxes(showgrid=False, showticklabels=False)
+    fig.update_yaxes(showgrid=False)
+    return clean_fig(fig, 320)
+
+
+# ─── ROW 2 ────────────────────────────────────────────────────────────────────
+def sales_by_region(reg_sales):
+    fig = go.Figure(go.Pie(
+        labels=reg_sales["Region"],
+        values=_f64(reg_sales["Sales"]),
+        hole=0.52,
+        marker=dict(colors=COLORS),
+        textinfo="label+percent",
+        textfont=dict(size=11),
+        hovertemplate="<b>%{label}</b><br>Sales: $%{value:,.0f}<extra></extra>"
+    ))
+    fig.add_annotation(text=f"<b>{fmt(reg_sales['Sales'].sum())}</b>",
+                       x=0.5, y=0.5, font_size=13, showarrow=False)
+    return clean_fig(fig, 320)
+
+
+def category_trends(month_category, gran="Month"):
+    # imported here: plotly.express alone costs ~150 ms of cold start
+    import plotly.express as px
+
+    mt = thin(month_category.sort_values(gran), gran, "Sales",
+              config.MAX_POINTS, config.DOWNSAMPLE, by="Category")
+    webgl = len(mt) > config.WEBGL_POINTS
+    fig = px.line(mt, x=gran, y="Sales", color="Category",
+                  color_discrete_sequence=COLORS, template=TEMPLATE,
+                  markers=not webgl,
+                  render_mode="webgl" if webgl else "auto")
+    fig.update_traces(marker_size=4, line_width=2)
+    _time_axis(fig, mt[gran].unique(), gran)
+    return clean_fig(fig, 320)
+
+
+def top_products_html(product_sales, n=8):
+    top_prods = top_k(product_sales, "Sales", n)
+    max_val   = top_prods["Sales"].max()
+    rows_html = ""
+    for idx, (name, sales) in enumerate(zip(top_prods["Product"].tolist(), top_prods["Sales"].tolist())):
+        pct   = int(sales / max_val * 100)
+        rows_html += f"""
+        <div class="prod-row">
+            <span class="prod-rank">#{idx+1}</span>
+            <span class="prod-name">{name[:22]}{'…' if len(name)>22 else ''}</span>
+            <div class="prod-bar-wrap"><div class="prod-bar" style="width:{pct}%"></div></div>
+            <span class="prod-val">{fmt(sales)}</span>
+        </div>"""
+    return f'<div class="chart-card" style="padding:16px 20px">{rows_html}</div>'
+
+
+# ─── ROW 3 ────────────────────────────────────────────────────────────────────
+def subcategory_margin(sub_sales):
+    sub_pm = sub_sales.copy()
+    sub_pm["Margin%"] = (sub_pm["Profit"] / sub_pm["Sales"] * 100).round(1)
+    sub_pm = sub_pm.sort_values("Margin%", ascending=False)
+
+    colors_pm = ["#059669" if v >= 20 else "#d97706" if v >= 10 else "#dc2626" for v in sub_pm["Margin%"]]
+    fig = go.Figure(go.Bar(
+        x=sub_pm["Sub-Category"], y=_f64(sub_pm["Margin%"]),
+        marker_color=colors_pm,
+        text=[f"{v}%" for v in sub_pm["Margin%"]],
+        textposition="outside",
+        textfont=dict(size=10),
+    ))
+    fig.add_hline(y=20, line_dash="dash", line_color="#b8860b", annotation_text="Target 20%",
+                  annotation_font_size=10, annotation_font_color="#b8860b")
+    fig.update_yaxes(title_text="Margin %", ticksuffix="%")
+    return clean_fig(fig, 300)
+
+
+def revenue_by_segment(seg_rev):
+    fig = go.Figure(go.Pie(
+        labels=seg_rev["Segment"],
+        values=_f64(seg_rev["Revenue"]),
+        hole=0.45,
+        marker=dict(colors=["#b8860b","#d4a017","#8b6914"]),
+        textinfo="label+percent",
+        textfont=dict(size=11),
+    ))
+    return clean_fig(fig, 300)
+
+
+def build_figures(view, series=None, gran="Month"):
+    """Every chart for one filter combination, keyed fig1..fig6 plus ``top_products``."""
+    series = series or view
+    return {
+        "fig1":         revenue_over_time(series["monthly"], gran),
+        "fig2":         sales_by_category(view["category"]),
+        "fig3":         sales_by_region(view["region"]),
+        "fig4":         category_trends(series["month_category"], gran),
+        "top_products": top_products_html(view["product"]),
+        "fig5":         subcategory_margin(view["sub_category"]),
+        "fig6":         revenue_by_segment(view["segment"]),
+    }
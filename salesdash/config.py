@@ -0,0 +1,57 @@
+import os
+
+# ─── RUNTIME SETTINGS (override via environment) ──────────────────────────────
+ROWS = int(os.environ.get("SALESDASH_ROWS", 1000))
+SEED = int(os.environ.get("SALESDASH_SEED", 42))
+
+# path to a real export (.csv/.parquet/.arrow/.sqlite); empty → synthetic data
+SOURCE = os.environ.get("SALESDASH_SOURCE", "")
+TABLE  = os.environ.get("SALESDASH_TABLE", "orders")
+
+# byte budget of the cross-session result cache (per process)
+CACHE_MB = int(os.environ.get("SALESDASH_CACHE_MB", 256))
+
+# time-series charts: per-trace point budget, thinning method and WebGL switch
+MAX_POINTS   = int(os.environ.get("SALESDASH_MAX_POINTS", 2000))
+DOWNSAMPLE   = os.environ.get("SALESDASH_DOWNSAMPLE", "lttb")    # lttb | minmax
+WEBGL_POINTS = int(os.environ.get("SALESDASH_WEBGL_POINTS", 1000))
+
+# perf instrumentation: sidebar panel (also ?perf=1) and JSON line per rerun ("-" = stderr)
+PERF_PANEL = os.environ.get("SALESDASH_PERF_PANEL", "") == "1"
+PERF_LOG   = os.environ.get("SALESDASH_PERF_LOG", "")
+
+# render Row 3 and the raw-data table on demand inside fragments
+LAZY = os.environ.get("SALESDASH_LAZY", "") == "1"
+
+# append-only ingestion: drop directory of export files and/or a SQLite table polled by rowid
+# (each dropped file is read once by name: write it under a ".name" and rename it into place);
+# each batch copies the frame, so append mode cannot be combined with SALESDASH_SHARED_DIR
+APPEND_DIR    = os.environ.get("SALESDASH_APPEND_DIR", "")
+APPEND_SQLITE = os.environ.get("SALESDASH_APPEND_SQLITE", "")
+POLL_SECONDS  = float(os.environ.get("SALESDASH_POLL_SECONDS", 30))
+
+# execution backend: "pandas" (in memory) or "duckdb" (SQL over SALESDASH_SOURCE, a Parquet/CSV path or glob)
+BACKEND       = os.environ.get("SALESDASH_BACKEND", "pandas")
+DUCKDB_MEMORY = os.environ.get("SALESDASH_DUCKDB_MEMORY", "")      # e.g. "4GB"; empty → DuckDB default
+
+# multi-worker deployments: publish the dataset once here as .npy files that every worker memory-maps
+SHARED_DIR = os.environ.get("SALESDASH_SHARED_DIR", "")
+
+# worker threads for a rerun's independent chart rollups (0 → run them one after another)
+WORKERS = int(os.environ.get("SALESDASH_WORKERS", 0))
+
+# directory written by `python -m salesdash.materialize`; used when its dataset version matches
+MATERIALIZED = os.environ.get("SALESDASH_MATERIALIZED", "")
+
+# top products / distinct customers: "exact" (partial selection, exact distinct) or "sketch"
+# (one streaming pass through a SpaceSaving heavy-hitters sketch and a HyperLogLog)
+TOPK          = os.environ.get("SALESDASH_TOPK", "exact")
+TOPK_CAPACITY = int(os.environ.get("SALESDASH_TOPK_CAPACITY", 1024))   # SpaceSaving counters
+HLL_PRECISION = int(os.environ.get("SALESDASH_HLL_PRECISION", 14))     # 2**p registers, ~1.04/sqrt(2**p) error
+
+# largest selection the raw-data download button will export: Streamlit keeps a finished
+# download in its in-memory media store, so the file costs its full size in server memory
+EXPORT_MAX_ROWS = int(os.environ.get("SALESDASH_EXPORT_MAX_ROWS", 1_000_000))
+
+# compact in-memory frame: float32 measures, narrow ints, time labels derived from the date on demand
+COMPACT = os.environ.get("SALESDASH_COMPACT", "") == "1"
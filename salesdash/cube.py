@@ -0,0 +1,120 @@
+"""Pre-aggregated cube behind every KPI and chart.
+
+The raw rows are rolled up once to the finest grain the dashboard shows
+(Year x Month x Region x Category x Segment x Sub-Category x Product). Filter
+changes then slice that cube and re-aggregate a few thousand cells instead of
+re-scanning every order. An Order Date range that covers whole months is a
+slice on Month too; any other range rebuilds the cube from its rows.
+"""
+import pandas as pd
+
+from salesdash.schema import DATE, column, widen
+
+GRAIN    = ["Year", "Month", "Region", "Category", "Segment", "Sub-Category", "Product"]
+MEASURES = ["Sales", "Revenue", "Profit", "Quantity"]
+FILTERS  = ["Year", "Region", "Category", "Segment"]
+
+# name → (group-by columns, summed measures) for each chart
+VIEWS = {
+    "monthly":        (["Month"],             ["Revenue", "Sales"]),
+    "category":       (["Category"],          ["Sales"]),
+    "region":         (["Region"],            ["Sales"]),
+    "month_category": (["Month", "Category"], ["Sales"]),
+    "product":        (["Product"],           ["Sales"]),
+    "sub_category":   (["Sub-Category"],      ["Sales", "Profit"]),
+    "segment":        (["Segment"],           ["Revenue"]),
+}
+
+
+def build_cube(df):
+    """Roll raw orders up to :data:`GRAIN` with summed measures and an order count."""
+    aggs = {m: (m, "sum") for m in MEASURES}
+    aggs["Orders"] = ("Sales", "size")
+    # compact frames: time labels derived here, float32 measures summed in float64
+    keys = [column(df, c) for c in GRAIN]
+    values = widen(df[MEASURES])
+    return values.groupby(keys, observed=True, sort=False).agg(**aggs).reset_index()
+
+
+def cube_columns(df):
+    """The columns of ``df`` that :func:`build_cube` reads."""
+    return [c for c in [DATE] + GRAIN + MEASURES if c in df]
+
+
+def filter_options(cube):
+    """Sidebar choices: sorted values of each :data:`FILTERS` column, the full month axis and the row count."""
+    options = {col: sorted(cube[col].unique().tolist()) for col in FILTERS}
+    options["Month"] = [str(m) for m in cube["Month"].cat.categories]
+    options["rows"] = int(cube["Orders"].sum())
+    return options
+
+
+def month_span(date_range):
+    """Month labels of an inclusive ``(start, end)`` range that covers whole months, else ``None``."""
+    start, end = (pd.Timestamp(t).normalize() for t in date_range)
+    if start.day != 1 or not end.is_month_end or start > end:
+        return None
+    return [str(p) for p in pd.period_range(start, end, freq="M")]
+
+
+def cube_filters(filters):
+    """``filters`` with a month-aligned Order Date range turned into a Month filter; ``None`` if unaligned."""
+    if DATE not in filters:
+        return filters
+    months = month_span(filters[DATE])
+    if months is None:
+        return None
+    out = {c: v for c, v in filters.items() if c != DATE}
+    out["Month"] = months
+    return out
+
+
+def slice_cube(cube, filters):
+    """Return the cube cells matching ``{column: value or [values]}`` filters."""
+    aligned = cube_filters(filters)
+    if aligned is None:
+        raise ValueError(f"{DATE} range {filters[DATE]} does not cover whole months; use filter_cells")
+    mask = None
+    for col, value in aligned.items():
+        m = cube[col].isin(value) if isinstance(value, (list, tuple, set, frozenset)) else cube[col] == value
+        mask = m if mask is None else mask & m
+    return cube if mask is None else cube[mask]
+
+
+def filter_cells(cube, filters, rebuild):
+    """Cube cells for ``filters``: a slice when it can be, else ``rebuild()`` from the matching rows."""
+    return slice_cube(cube, filters) if cube_filters(filters) is not None else rebuild()
+
+
+def rollup(cells, by, measures):
+    return cells.groupby(by, observed=True)[measures].sum().reset_index()
+
+
+def kpis(cells):
+    sales, revenue, profit = (float(cells[m].sum()) for m in ("Sales", "Revenue", "Profit"))
+    orders = int(cells["Orders"].sum())
+    return {
+        "total_sales":   sales,
+        "total_revenue": revenue,
+        "total_profit":  profit,
+        "profit_margin": (profit / revenue * 100) if revenue > 0 else 0,
+        "total_orders":  orders,
+        "avg_order_val": sales / orders if orders > 0 else 0,
+    }
+
+
+def compute_view(cells, names=None, pool=None):
+    """KPIs plus one aggregated frame per entry in :data:`VIEWS` (or just ``names``).
+
+    With a ``concurrent.futures`` executor as ``pool`` the rollups run
+    concurrently; they only read ``cells`` and pandas releases the GIL in its
+    group-by kernels.
+    """
+    names = list(names or VIEWS)
+    if pool is None:
+        view = {name: rollup(cells, *VIEWS[name]) for name in names}
+        view["kpis"] = kpis(cells)
+        return view
+    futures = {name: pool.submit(rollup, cells, *VIEWS[name]) for name in names}
+    futures["kpis"] = pool.submit(kpis, cells)
+    return {name: f.result() for name, f in futures.items()}
@@ -0,0 +1,165 @@
+"""Vectorized synthetic Superstore-style order data.
+
+Run ``python -m salesdash.datagen --rows 10000000 --out orders.parquet`` to
+write a reproducible benchmark fixture.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from salesdash import config
+from salesdash.schema import CUSTOMER, add_derived
+
+# ─── CATALOGUE ────────────────────────────────────────────────────────────────
+CATEGORIES = ["Technology", "Furniture", "Office Supplies"]
+SUB_CATS = {
+    "Technology":      ["Phones","Laptops","Accessories","Printers"],
+    "Furniture":       ["Chairs","Tables","Bookcases","Storage"],
+    "Office Supplies": ["Paper","Binders","Art","Fasteners"],
+}
+REGIONS  = ["West", "East", "Central", "South"]
+SEGMENTS = ["Consumer", "Corporate", "Home Office"]
+PRODUCTS = [
+    "Apple MacBook Pro","Dell XPS 15","Canon ImageClass","Logitech MX Master",
+    "Herman Miller Chair","IKEA Kallax Shelf","Fellowes Shredder","Avery Binders",
+    "Samsung Galaxy Tab","Sony WH-1000XM5","HP LaserJet Pro","Staples Paper Ream",
+    "Microsoft Surface","Cisco IP Phone","Bush Bookcase","3M Post-it Notes",
+]
+DISCOUNTS = np.array([0, 0.1, 0.2, 0.3, 0.4])
+
+START, END = pd.Timestamp("2022-01-01"), pd.Timestamp("2024-12-31")
+MONTHS     = pd.period_range(START, END, freq="M")
+
+# flattened so a (category, slot) pair maps straight to a sub-category code
+_SUB_FLAT   = [s for c in CATEGORIES for s in SUB_CATS[c]]
+_SUBS_PER_CAT = len(SUB_CATS[CATEGORIES[0]])
+
+# rows per independently seeded block: any chunking of the rows draws the same values
+BLOCK = 1 << 16
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _customers(lo, hi, total):
+    """Skewed customer ids (~``total / 5`` of them) hashed from row positions."""
+    u = (np.arange(lo, hi, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15) >> np.uint64(11)) / 2.0**53
+    return (max(total // 5, 1) * u * u).astype("int64")
+
+
+def _block(seed, b):
+    """Random columns of block ``b``, always drawn in full from its own generator."""
+    rng = np.random.default_rng([seed, b])
+    return {
+        "category": rng.integers(0, len(CATEGORIES), BLOCK),
+        "slot":     rng.integers(0, _SUBS_PER_CAT, BLOCK),
+        "sales":    rng.uniform(50, 3000, BLOCK).round(2),
+        "quantity": rng.integers(1, 10, BLOCK),
+        "region":   rng.integers(0, len(REGIONS), BLOCK),
+        "segment":  rng.integers(0, len(SEGMENTS), BLOCK),
+        "product":  rng.integers(0, len(PRODUCTS), BLOCK),
+        "discount": rng.integers(0, len(DISCOUNTS), BLOCK),
+        "margin":   rng.uniform(0.1, 0.4, BLOCK),
+    }
+
+
+def _draws(seed, lo, hi):
+    """Random columns for rows ``[lo, hi)``, sliced out of the blocks they fall in."""
+    parts = []
+    for b in range(lo // BLOCK, max(-(-hi // BLOCK), lo // BLOCK + 1)):
+        start = b * BLOCK
+        part = slice(max(lo, start) - start, min(hi, start + BLOCK) - start)
+        parts.append({k: v[part] for k, v in _block(seed, b).items()})
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def _frame(seed, lo, hi, total):
+    # same evenly spaced timeline as pd.date_range(START, END, periods=total)
+    step  = (END.value - START.value) / max(total - 1, 1)
+    dates = pd.DatetimeIndex(START.value + (np.arange(lo, hi) * step).astype("int64"))
+
+    r = _draws(seed, lo, hi)
+    df = pd.DataFrame({
+        "Order Date":   dates,
+        "Category":     _categorical(r["category"], CATEGORIES),
+        "Sub-Category": _categorical(r["category"] * _SUBS_PER_CAT + r["slot"], _SUB_FLAT),
+        "Region":       _categorical(r["region"], REGIONS),
+        "Segment":      _categorical(r["segment"], SEGMENTS),
+        "Product":      _categorical(r["product"], PRODUCTS),
+        "Sales":        r["sales"],
+        "Quantity":     r["quantity"],
+        "Discount":     DISCOUNTS[r["discount"]],
+        "Profit":       (r["sales"] * r["margin"]).round(2),
+    }, index=pd.RangeIndex(lo, hi))
+    df[CUSTOMER] = _customers(lo, hi, total)
+    # fixed month axis keeps categories identical across chunks
+    return add_derived(df, MONTHS)
+
+
+# ─── PUBLIC API ───────────────────────────────────────────────────────────────
+def generate_frame(n=config.ROWS, seed=config.SEED):
+    """Return ``n`` synthetic orders in a single frame."""
+    return _frame(seed, 0, n, n)
+
+
+def synthetic_version(n=config.ROWS, seed=config.SEED):
+    """Dataset version for generated data; changes with row count or seed."""
+    # "v2": per-block draws; rows differ from the earlier single-generator output
+    return f"synthetic-v2-{n}-{seed}"
+
+
+def iter_chunks(n=config.ROWS, chunk_size=1_000_000, seed=config.SEED):
+    """Yield ``n`` synthetic orders as frames of at most ``chunk_size`` rows.
+
+    Only one chunk is alive at a time, so memory stays bounded by
+    ``chunk_size``. Random values are drawn per fixed :data:`BLOCK` of rows,
+    so the concatenated chunks equal ``generate_frame(n, seed)`` for any
+    ``chunk_size``.
+    """
+    for lo in range(0, n, chunk_size):
+        yield _frame(seed, lo, min(lo + chunk_size, n), n)
+
+
+def write_fixture(path, n=config.ROWS, chunk_size=1_000_000, seed=config.SEED):
+    """Stream ``n`` synthetic orders to a ``.parquet`` or ``.csv`` file."""
+    path = str(path)
+    chunks = iter_chunks(n, chunk_size, seed)
+
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    elif path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, header=(i == 0), index=False)
+    else:
+        raise ValueError(f"unsupported fixture format: {path!r} (use .parquet or .csv)")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic sales fixture.")
+    parser.add_argument("--rows", type=int, default=config.ROWS)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=config.SEED)
+    parser.add_argument("--out", required=True, help="target .parquet or .csv file")
+    args = parser.parse_args(argv)
+    write_fixture(args.out, args.rows, args.chunk_size, args.seed)
+    print(f"wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Streaming export of the filtered orders as CSV, gzipped CSV or Parquet.
+
+The selection is walked in fixed-size row chunks and each chunk is encoded
+and yielded as bytes straight away, so the peak memory of an export is one
+chunk plus the encoder's buffer rather than the whole file twice over (frame
+copy + rendered text). The same byte generators feed the download button and
+can be written to any file object.
+
+Written to a file, an export stays on disk. Served through Streamlit's
+download button it does not: the media store reads the finished file into
+memory, so the app caps the selection it offers (``SALESDASH_EXPORT_MAX_ROWS``).
+"""
+import io
+import zlib
+
+from salesdash.schema import COLUMNS, widen
+
+CHUNK_ROWS = 100_000
+
+# label → (file extension, MIME type)
+FORMATS = {
+    "CSV":        (".csv",     "text/csv"),
+    "CSV (gzip)": (".csv.gz",  "application/gzip"),
+    "Parquet":    (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def export_columns(df):
+    return [c for c in COLUMNS if c in df]
+
+
+def frame_chunks(df, rows=None, columns=None, chunk_size=CHUNK_ROWS):
+    """Successive ``chunk_size``-row frames of ``df`` at positions ``rows`` (``None`` = all)."""
+    cols = [df.columns.get_loc(c) for c in (columns or export_columns(df))]
+    n = len(df) if rows is None else len(rows)
+    # an empty selection still yields one (empty) chunk so the file gets its header/schema
+    for lo in range(0, max(n, 1), chunk_size):
+        part = slice(lo, lo + chunk_size) if rows is None else rows[lo:lo + chunk_size]
+        # compact frames are exported with their original dtypes
+        yield widen(df.iloc[part, cols])
+
+
+# ─── ENCODERS ─────────────────────────────────────────────────────────────────
+def iter_csv(chunks, gzip=False):
+    # wbits=31 writes a gzip header/trailer around a single streaming deflate
+    z = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    header = True
+    for chunk in chunks:
+        data = chunk.to_csv(index=False, header=header).encode()
+        header = False
+        data = z.compress(data) if z else data
+        if data:
+            yield data
+    if z:
+        yield z.flush()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self.parts = []
+        self.pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.parts.append(bytes(b))
+        self.pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.pos
+
+    def drain(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def iter_parquet(chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink, writer = _Sink(), None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        # one row group per chunk, flushed to the caller as soon as it is encoded
+        writer.write_table(table.cast(writer.schema))
+        data = sink.drain()
+        if data:
+            yield data
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def stream(chunks, fmt):
+    """Bytes of the export in format ``fmt`` (a :data:`FORMATS` label), chunk by chunk."""
+    if fmt == "Parquet":
+        return iter_parquet(chunks)
+    return iter_csv(chunks, gzip=fmt == "CSV (gzip)")
+
+
+def write(chunks, fmt, fileobj):
+    """Stream an export into ``fileobj``; returns the number of bytes written."""
+    total = 0
+    for data in stream(chunks, fmt):
+        fileobj.write(data)
+        total += len(data)
+    return total
+
+
+def selection_file(df, index, backend, filters, export_fmt):
+    """The download button's deferred ``data``: the whole selection encoded into a ``BytesIO``.
+
+    Streamlit keeps the finished bytes in its media store either way, so an
+    in-memory buffer costs nothing extra over a spooled file.
+    """
+    # arguments are bound at click time: later reruns may rebind the app's globals
+    chunks = backend.chunks(filters) if backend else frame_chunks(df, index.select(filters))
+    out = io.BytesIO()
+    write(chunks, export_fmt, out)
+    out.seek(0)
+    return out
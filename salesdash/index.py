@@ -0,0 +1,174 @@
+"""Inverted index over the sidebar filter columns, plus the Order Date range.
+
+Built once per dataset: for every value of every filter column it keeps the
+sorted row positions holding that value. The rows are stored in Order Date
+order, so a date range is two binary searches into the date column and a
+contiguous block of row positions; each posting list is clipped to that
+block the same way. The smallest clipped selection is then checked against
+the remaining multi-select filters by set membership on value codes, so a
+query costs in proportion to its result rather than to the table.
+Data that is not date-sorted (e.g. after an out-of-order append) falls back
+to a date mask over the candidate rows.
+"""
+import numpy as np
+import pandas as pd
+
+from salesdash.cube import FILTERS
+from salesdash.schema import DATE, column
+
+
+def _is_multi(value):
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+def _is_sorted(dates):
+    return bool((dates[1:] >= dates[:-1]).all())
+
+
+def date_bounds(date_range, dtype):
+    """Inclusive ``(start, end)`` dates → half-open ``[lo, hi)`` instants in ``dtype``."""
+    start, end = (pd.Timestamp(t).normalize() for t in date_range)
+    return (np.datetime64(start).astype(dtype),
+            np.datetime64(end + pd.Timedelta(days=1)).astype(dtype))
+
+
+class FilterIndex:
+    def __init__(self, df, columns=FILTERS):
+        self.n_rows = len(df)
+        dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self.postings = {}
+        for col in columns:
+            codes, uniques = pd.factorize(column(df, col), sort=True)
+            # stable sort keeps row ids ascending inside each value's run
+            order  = np.argsort(codes, kind="stable").astype(dtype, copy=False)
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.postings[col] = {
+                val: order[bounds[i]:bounds[i + 1]] for i, val in enumerate(uniques.tolist())
+            }
+        self._set_dates(df[DATE].to_numpy() if DATE in df else None)
+
+    def _set_dates(self, dates, sorted_=None):
+        self.dates = dates
+        self.date_sorted = dates is not None and (_is_sorted(dates) if sorted_ is None else sorted_)
+        self._codes = {}
+
+    @classmethod
+    def from_postings(cls, n_rows, postings, dates=None):
+        """Wrap ready-made ``{column: {value: sorted row ids}}`` (e.g. memory-mapped) as an index."""
+        new = object.__new__(cls)
+        new.n_rows = n_rows
+        new.postings = postings
+        new._set_dates(dates)
+        return new
+
+    def extended(self, batch, offset, dates=None):
+        """A new index covering ``batch`` appended at row ``offset``; ``self`` is untouched.
+
+        ``dates`` is the combined date column (default: this index's dates
+        followed by the batch's).
+        """
+        postings = {}
+        for col, posting in self.postings.items():
+            posting = dict(posting)
+            codes, uniques = pd.factorize(column(batch, col), sort=True)
+            for i, val in enumerate(uniques.tolist()):
+                rows = (np.flatnonzero(codes == i) + offset).astype(np.int64)
+                old = posting.get(val)
+                posting[val] = rows if old is None else np.concatenate([old, rows.astype(old.dtype)])
+            postings[col] = posting
+        new = FilterIndex.from_postings(offset + len(batch), postings)
+        if self.dates is not None and DATE in batch:
+            if dates is None:
+                dates = np.concatenate([self.dates, batch[DATE].to_numpy().astype(self.dates.dtype)])
+            # only the seam and the new rows need checking
+            new._set_dates(dates, self.date_sorted and _is_sorted(dates[max(offset - 1, 0):]))
+        return new
+
+    def values(self, col):
+        return list(self.postings[col])
+
+    def codes(self, col):
+        """Per-row position of each row's value in ``postings[col]`` (built on first use)."""
+        if col not in self._codes:
+            posting = self.postings[col]
+            codes = np.empty(self.n_rows, dtype=np.int8 if len(posting) < 128 else np.int32)
+            for i, rows in enumerate(posting.values()):
+                codes[rows] = i
+            self._codes[col] = codes
+        return self._codes[col]
+
+    def date_span(self, date_range):
+        """``[lo, hi)`` row positions inside ``date_range`` (requires date-sorted rows)."""
+        lo, hi = date_bounds(date_range, self.dates.dtype)
+        return int(np.searchsorted(self.dates, lo, "left")), int(np.searchsorted(self.dates, hi, "left"))
+
+    def rows_for(self, col, value, lo=0, hi=None):
+        """Sorted row positions in ``[lo, hi)`` where ``col`` equals ``value`` (or any of a list)."""
+        posting = self.postings[col]
+        values = value if _is_multi(value) else [value]
+        parts = [posting[v] for v in values if v in posting]
+        if hi is not None:
+            parts = [p[np.searchsorted(p, lo):np.searchsorted(p, hi)] for p in parts]
+        parts = [p for p in parts if len(p)]
+        if len(parts) == 1:
+            return parts[0]
+        # postings of one column are disjoint, so a union is concat + sort
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def _count(self, col, value, lo, hi):
+        posting = self.postings[col]
+        values = value if _is_multi(value) else [value]
+        return sum(int(np.searchsorted(posting[v], hi) - np.searchsorted(posting[v], lo))
+                   for v in values if v in posting)
+
+    def _member(self, col, value, rows):
+        """Mask of ``rows`` whose ``col`` value is among ``value``: a lookup on value codes."""
+        values = set(value) if _is_multi(value) else {value}
+        wanted = np.fromiter((v in values for v in self.postings[col]), dtype=bool, count=len(self.postings[col]))
+        return wanted[self.codes(col)[rows]]
+
+    def select(self, filters):
+        """Row positions matching every ``{column: value(s)}`` filter.
+
+        An Order Date filter is an inclusive ``(start, end)`` pair. Returns
+        ``None`` when no filter is active (i.e. every row matches).
+        """
+        dims = {c: v for c, v in filters.items() if c != DATE}
+        date_range = filters.get(DATE)
+        if not dims and date_range is None:
+            return None
+        dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        lo, hi = 0, self.n_rows
+        if date_range is not None and self.date_sorted:
+            lo, hi = self.date_span(date_range)
+            date_range = None
+        if not dims:
+            rows = np.arange(lo, hi, dtype=dtype)
+        else:
+            # start from the smallest clipped selection; test the others by membership
+            counts = {c: self._count(c, v, lo, hi) for c, v in dims.items()}
+            first = min(counts, key=counts.get)
+            rows = self.rows_for(first, dims.pop(first), lo, hi)
+            for col, value in dims.items():
+                if not len(rows):
+                    break
+                rows = rows[self._member(col, value, rows)]
+        if date_range is not None:
+            start, end = date_bounds(date_range, self.dates.dtype)
+            if len(rows) == self.n_rows:
+                rows = np.flatnonzero((self.dates >= start) & (self.dates < end)).astype(dtype)
+            else:
+                dates = self.dates[rows]
+                rows = rows[(dates >= start) & (dates < end)]
+        return rows
+
+    def take(self, df, filters, columns=None):
+        """Materialize the filtered rows (optionally only ``columns``) in one pass."""
+        rows = self.select(filters)
+        frame = df if columns is None else df[columns]
+        return frame if rows is None else frame.iloc[rows]
+
+    def nbytes(self):
+        # the date column is the frame's own array and is not counted here
+        postings = sum(a.nbytes for posting in self.postings.values() for a in posting.values())
+        return postings + sum(c.nbytes for c in self._codes.values())
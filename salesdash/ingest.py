@@ -0,0 +1,110 @@
+"""Columnar loaders for real Superstore-style exports.
+
+Every loader reads only the columns the dashboard uses, parses dates once,
+stores the text dimensions as ``category`` and derives Year / Month /
+MonthName / Revenue a single time at load.
+"""
+import hashlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from salesdash.schema import COLUMNS, DATE, DIMENSIONS, REQUIRED, add_derived
+
+LOADERS = {}
+
+
+def register_loader(*extensions):
+    """Register a ``fn(path, columns, table) -> DataFrame`` for extensions."""
+    def wrap(fn):
+        for ext in extensions:
+            LOADERS[ext.lower()] = fn
+        return fn
+    return wrap
+
+
+# ─── FORMATS ──────────────────────────────────────────────────────────────────
+@register_loader(".csv", ".csv.gz", ".txt")
+def _load_csv(path, columns, table):
+    return pd.read_csv(
+        path,
+        usecols=lambda c: c in columns,
+        dtype={c: "category" for c in DIMENSIONS},
+        parse_dates=[DATE],
+    )
+
+
+@register_loader(".parquet", ".pq")
+def _load_parquet(path, columns, table):
+    import pyarrow.parquet as pq
+
+    present = set(pq.read_schema(path).names)
+    cols = [c for c in columns if c in present]
+    table = pq.read_table(path, columns=cols, read_dictionary=[c for c in DIMENSIONS if c in present])
+    return table.to_pandas()
+
+
+@register_loader(".arrow", ".feather", ".ipc")
+def _load_arrow(path, columns, table):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, memory_map=True)
+    table = table.select([c for c in columns if c in table.column_names])
+    for c in DIMENSIONS:
+        i = table.schema.get_field_index(c)
+        if i >= 0 and not pa.types.is_dictionary(table.schema.field(i).type):
+            table = table.set_column(i, c, table.column(i).dictionary_encode())
+    return table.to_pandas()
+
+
+@register_loader(".sqlite", ".sqlite3", ".db")
+def _load_sqlite(path, columns, table):
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as con:
+        present = {row[1] for row in con.execute(f'PRAGMA table_info("{table}")')}
+        if not present:
+            raise ValueError(f"table {table!r} not found in {path}")
+        cols = ", ".join(f'"{c}"' for c in columns if c in present)
+        return pd.read_sql_query(f'SELECT {cols} FROM "{table}"', con)
+
+
+# ─── PUBLIC API ───────────────────────────────────────────────────────────────
+def _extension(path):
+    name = os.path.basename(str(path)).lower()
+    for ext in sorted(LOADERS, key=len, reverse=True):
+        if name.endswith(ext):
+            return ext
+    raise ValueError(f"no loader registered for {path!r}; known: {', '.join(sorted(LOADERS))}")
+
+
+def source_version(path):
+    """Cheap content version for a source file: path, size and mtime."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def normalize(df):
+    """Coerce a raw export to the dashboard schema and add derived columns."""
+    missing = [c for c in REQUIRED if c not in df]
+    if missing:
+        raise ValueError(f"source is missing required columns: {', '.join(missing)}")
+    if not pd.api.types.is_datetime64_any_dtype(df[DATE]):
+        df[DATE] = pd.to_datetime(df[DATE])
+    for c in DIMENSIONS:
+        if not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    # date-ordered storage: date ranges become binary searches in the filter index
+    if not df[DATE].is_monotonic_increasing:
+        df = df.sort_values(DATE, kind="stable", ignore_index=True)
+    return add_derived(df)
+
+
+def load_dataset(path, table="orders"):
+    """Load a CSV, Parquet, Arrow IPC or SQLite export into the dashboard schema.
+
+    ``table`` names the source table and is only used by database loaders.
+    """
+    df = LOADERS[_extension(path)](path, COLUMNS, table)
+    return normalize(df)
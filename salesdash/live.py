@@ -0,0 +1,197 @@
+"""Append-only ingestion of new orders into the in-memory dataset.
+
+A :class:`LiveDataset` owns the frame together with its cube and filter
+index. Each appended batch gets its derived columns computed on its own,
+is merged into the cube at group level and into the index posting lists,
+and bumps the dataset version so every version-keyed cache moves on.
+Readers take a consistent :meth:`LiveDataset.snapshot`; appends swap in new
+objects and never mutate ones a rerun may still be reading.
+
+Batches come from watchers polled on rerun: a drop directory of export
+files, or a SQLite table read past its last seen ``rowid``. A watcher moves
+its position only once a batch is appended, so a failed poll (a malformed
+file, a locked database) is logged and retried on the next one.
+
+Each append concatenates the batch onto the whole frame, an O(rows) copy:
+suited to a steady trickle of orders, not to many tiny batches on huge data.
+It also turns a memory-mapped shared frame into a private copy, so append
+mode and ``SALESDASH_SHARED_DIR`` are not combined.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from salesdash.cube import GRAIN, build_cube
+from salesdash.index import FilterIndex
+from salesdash.ingest import LOADERS, load_dataset, normalize
+from salesdash.schema import COLUMNS, DATE, compact as compact_frame
+
+log = logging.getLogger("salesdash.live")
+
+# chronological categories: new labels may not simply be appended, and the month
+# axis stays gap-free (periods.prefix_sums relies on one category per calendar month)
+_TIME_ORDERED = {"Month": "%Y-%m", "MonthName": "%b %Y"}
+
+
+def _align_categories(df, batch):
+    """Give ``df`` and ``batch`` identical categories so concat keeps ``category`` dtype."""
+    for col in df.columns:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype) or col not in batch:
+            continue
+        old = list(df[col].cat.categories)
+        extra = [c for c in pd.unique(batch[col].astype(object).dropna()) if c not in set(old)]
+        cats = old + extra
+        if col in _TIME_ORDERED and extra:
+            fmt = _TIME_ORDERED[col]
+            seen = pd.to_datetime(pd.Index(cats), format=fmt)
+            cats = [p.strftime(fmt) for p in pd.period_range(seen.min(), seen.max(), freq="M")]
+        if cats != old:
+            df[col] = df[col].cat.set_categories(cats)
+        batch[col] = batch[col].astype(object).astype(pd.CategoricalDtype(cats))
+    return df, batch
+
+
+class LiveDataset:
+    def __init__(self, df, base_version, cube=None, index=None, compact=False):
+        self.base_version = base_version
+        self.compact = compact      # narrow each batch like the (compact) frame before appending
+        self.seq     = 0
+        self.watchers = []
+        self._lock   = threading.Lock()
+        self._poll_lock = threading.Lock()    # one poller at a time: a batch is read and appended once
+        self._polled = 0.0
+        self._state  = (df, build_cube(df) if cube is None else cube, FilterIndex(df) if index is None else index)
+
+    @property
+    def version(self):
+        return self.base_version if not self.seq else f"{self.base_version}+{self.seq}"
+
+    def snapshot(self):
+        """``(df, cube, index, version)`` that stay mutually consistent."""
+        with self._lock:
+            df, cube, index = self._state
+            return df, cube, index, self.version
+
+    def append(self, batch):
+        """Append normalized rows; returns the number of rows added."""
+        if batch is None or not len(batch):
+            return 0
+        with self._lock:
+            df, cube, index = self._state
+            df = df.copy(deep=False)
+            batch = compact_frame(batch) if self.compact else batch
+            df, batch = _align_categories(df, batch.reset_index(drop=True))
+            offset = len(df)
+
+            new_df = pd.concat([df, batch[df.columns]], ignore_index=True)
+            # merge at group level: cost follows the number of cube cells, not rows
+            cube, batch_cube = _align_categories(cube.copy(deep=False), build_cube(batch))
+            new_cube = (pd.concat([cube, batch_cube], ignore_index=True)
+                        .groupby(GRAIN, observed=True, sort=False).sum().reset_index())
+            new_index = index.extended(batch, offset, new_df[DATE].to_numpy() if DATE in new_df else None)
+
+            self._state = (new_df, new_cube, new_index)
+            self.seq += 1
+        return len(batch)
+
+    def add_watcher(self, watcher):
+        self.watchers.append(watcher)
+
+    def poll(self, every=0.0):
+        """Pull new batches from every watcher, at most once per ``every`` seconds.
+
+        Reruns arriving while another one polls skip straight to the current snapshot.
+        """
+        if not self.watchers or not self._poll_lock.acquire(blocking=False):
+            return 0
+        try:
+            now = time.monotonic()
+            if now - self._polled < every:
+                return 0
+            self._polled = now
+            added = 0
+            for watcher in self.watchers:
+                try:
+                    for batch in watcher.poll():
+                        added += self.append(batch)
+                except Exception:
+                    # never surfaces in the rerun that happened to poll; the position is kept
+                    log.exception("%s poll failed; retrying on the next poll", type(watcher).__name__)
+            return added
+        finally:
+            self._poll_lock.release()
+
+
+# ─── WATCHERS ─────────────────────────────────────────────────────────────────
+class DropDirWatcher:
+    """Ingests every new export file (any registered format) dropped in ``path``.
+
+    Files are immutable once they appear: each name is ingested exactly once, and
+    later changes to it are ignored. Writers must publish atomically, writing to a
+    dot-prefixed (ignored) name and renaming it into place when complete.
+    """
+
+    def __init__(self, path, table="orders"):
+        self.path  = path
+        self.table = table
+        self.seen  = set()
+
+    def poll(self):
+        try:
+            names = sorted(os.listdir(self.path))
+        except FileNotFoundError:
+            return
+        for name in names:
+            full = os.path.join(self.path, name)
+            if name in self.seen or name.startswith(".") or not any(name.lower().endswith(ext) for ext in LOADERS):
+                continue
+            try:
+                batch = load_dataset(full, self.table)
+            except Exception:
+                # one unreadable file does not hold back the others; it is retried next poll
+                log.exception("cannot ingest %s; retrying on the next poll", full)
+                continue
+            yield batch
+            self.seen.add(name)     # only once the batch is appended
+
+
+class SQLiteWatcher:
+    """Reads rows of ``table`` whose ``rowid`` is above the last one seen."""
+
+    def __init__(self, path, table="orders", from_end=False):
+        self.path  = path
+        self.table = table
+        self.last_rowid = self._max_rowid() if from_end else 0
+
+    def _connect(self):
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def _max_rowid(self):
+        with self._connect() as con:
+            return con.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{self.table}"').fetchone()[0]
+
+    def _read(self, where):
+        with self._connect() as con:
+            present = {row[1] for row in con.execute(f'PRAGMA table_info("{self.table}")')}
+            if not present:
+                raise ValueError(f"table {self.table!r} not found in {self.path}")
+            cols = ", ".join(f'"{c}"' for c in COLUMNS if c in present)
+            return pd.read_sql_query(
+                f'SELECT rowid AS _rowid, {cols} FROM "{self.table}" WHERE rowid {where} ? ORDER BY rowid',
+                con, params=(self.last_rowid,))
+
+    def base(self):
+        """Rows up to the current ``rowid`` mark: the base frame when this table is also the source,
+        so rows inserted while it loads arrive once, in the first poll."""
+        return normalize(self._read("<=").drop(columns="_rowid"))
+
+    def poll(self):
+        batch = self._read(">")
+        if len(batch):
+            last = int(batch["_rowid"].iloc[-1])
+            yield normalize(batch.drop(columns="_rowid"))
+            self.last_rowid = last      # only once the batch is appended
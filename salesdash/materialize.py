@@ -0,0 +1,114 @@
+"""Offline materialization of the cube and the unfiltered views.
+
+    python -m salesdash.materialize --out materialized/              # once, or from cron
+    python -m salesdash.materialize --out materialized/ --if-stale   # no-op while fresh
+
+Loads the configured dataset (``SALESDASH_SOURCE`` or the synthetic one),
+builds the cube and every rollup of the unfiltered dashboard, and writes them
+as Parquet next to a ``manifest.json`` recording the dataset version. With
+``SALESDASH_MATERIALIZED`` pointing at that directory the app takes the cube
+and the landing view from disk, and falls back to computing them live
+whenever the manifest's version no longer matches the data.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import pandas as pd
+
+from salesdash import config
+from salesdash.cube import VIEWS, build_cube, compute_view
+from salesdash.datagen import generate_frame, synthetic_version
+from salesdash.ingest import load_dataset, source_version
+
+MANIFEST = "manifest.json"
+FORMAT   = 1
+
+
+def dataset_version(source=config.SOURCE, rows=config.ROWS, seed=config.SEED):
+    return source_version(source) if source else synthetic_version(rows, seed)
+
+
+def read_manifest(out):
+    try:
+        with open(os.path.join(out, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _matches(manifest, version):
+    return bool(manifest) and manifest.get("format") == FORMAT and manifest.get("version") == version
+
+
+def is_fresh(out, version):
+    return _matches(read_manifest(out), version)
+
+
+def write(out, df, version):
+    """Write cube + unfiltered views for ``df``; the manifest is replaced last, atomically."""
+    os.makedirs(out, exist_ok=True)
+    cube = build_cube(df)
+    view = compute_view(cube)
+    # file names carry the version so readers of the previous manifest keep valid files
+    tables = {"cube": cube, **{name: view[name] for name in VIEWS}}
+    files = {}
+    for name, frame in tables.items():
+        files[name] = f"{name}-{version}.parquet"
+        frame.to_parquet(os.path.join(out, files[name]), index=False)
+
+    manifest = {
+        "format":  FORMAT,
+        "version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "rows":    len(df),
+        "kpis":    view["kpis"],
+        "files":   files,
+    }
+    tmp = os.path.join(out, f".{MANIFEST}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out, MANIFEST))
+
+    for path in glob.glob(os.path.join(out, "*.parquet")):
+        if os.path.basename(path) not in files.values():
+            os.remove(path)
+    return manifest
+
+
+def load(out, version):
+    """``{"cube": frame, "view": compute_view-shaped dict}`` if fresh for ``version``, else ``None``."""
+    manifest = read_manifest(out)
+    if not _matches(manifest, version):
+        return None
+    try:
+        frames = {name: pd.read_parquet(os.path.join(out, file)) for name, file in manifest["files"].items()}
+    except OSError:
+        return None
+    cube = frames.pop("cube")
+    return {"cube": cube, "view": {**frames, "kpis": manifest["kpis"]}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the dashboard cube and rollups to Parquet.")
+    parser.add_argument("--out", default=config.MATERIALIZED or "materialized",
+                        help="target directory (default: $SALESDASH_MATERIALIZED or ./materialized)")
+    parser.add_argument("--if-stale", action="store_true",
+                        help="do nothing when the directory already matches the dataset version")
+    args = parser.parse_args(argv)
+
+    version = dataset_version()
+    if args.if_stale and is_fresh(args.out, version):
+        print(f"{args.out} is up to date ({version})")
+        return
+    t0 = time.perf_counter()
+    df = load_dataset(config.SOURCE, config.TABLE) if config.SOURCE else generate_frame(config.ROWS, config.SEED)
+    manifest = write(args.out, df, version)
+    print(f"materialized {manifest['rows']:,} rows ({version}) to {args.out} "
+          f"in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
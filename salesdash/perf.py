@@ -0,0 +1,124 @@
+"""Per-stage timing for dashboard reruns.
+
+A :class:`PerfMonitor` lives for the whole process. Each rerun opens a
+:class:`RunTimer`, calls ``run.lap("name")`` at the end of each section (or
+wraps one in ``with run.stage("name"):``) and calls ``finish()``. The monitor
+keeps a rolling window per stage for p50/p95 and hands the finished run to
+every registered sink (e.g. a JSON log line). :func:`memory_report` breaks
+the resident size of the dataset down by column and structure.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from salesdash.cache import sizeof
+
+log = logging.getLogger("salesdash.perf")
+
+
+class RunTimer:
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.started = time.time()
+        self.timings = {}
+        self._t0 = self._lap = time.perf_counter()
+
+    def lap(self, name):
+        """Charge the time since the previous lap to section ``name``."""
+        now = time.perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + now - self._lap
+        self._lap = now
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
+            self._lap = time.perf_counter()
+
+    def finish(self, **extra):
+        record = {
+            "ts":       round(self.started, 3),
+            "total_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "stages":   {k: round(v * 1000, 3) for k, v in self.timings.items()},
+            **extra,
+        }
+        self.monitor.record(record)
+        return record
+
+
+class PerfMonitor:
+    def __init__(self, window=500):
+        self.window = window
+        self.sinks  = []
+        self.last   = {}
+        self._hist  = defaultdict(lambda: deque(maxlen=window))
+        self._lock  = threading.Lock()
+
+    def run(self):
+        return RunTimer(self)
+
+    def add_sink(self, fn):
+        """Call ``fn(record)`` with every finished run's record."""
+        self.sinks.append(fn)
+
+    def record(self, record):
+        with self._lock:
+            self.last = record
+            for name, ms in record["stages"].items():
+                self._hist[name].append(ms)
+            self._hist["total"].append(record["total_ms"])
+        for sink in self.sinks:
+            sink(record)
+
+    def summary(self):
+        """``[{stage, last_ms, p50_ms, p95_ms, runs}]`` over the rolling window."""
+        with self._lock:
+            hist = {k: np.asarray(v) for k, v in self._hist.items()}
+            last = dict(self.last.get("stages", {}), total=self.last.get("total_ms"))
+        return [
+            {
+                "stage":  name,
+                "last_ms": last.get(name),
+                "p50_ms": round(float(np.percentile(v, 50)), 2),
+                "p95_ms": round(float(np.percentile(v, 95)), 2),
+                "runs":   len(v),
+            }
+            for name, v in hist.items() if len(v)
+        ]
+
+
+def json_log_sink(target):
+    """Sink writing one JSON line per rerun to ``"-"`` (stderr) or a file path."""
+    handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return lambda record: log.info(json.dumps(record, default=str))
+
+
+def memory_report(df, **parts):
+    """``[{part, dtype, mb, bytes_per_row}]`` for each column of ``df``, the frame, each named
+    extra (an index, a cube, the result cache…) and the total."""
+    usage = df.memory_usage(deep=True, index=False)
+    rows = [(col, str(df[col].dtype), int(usage[col])) for col in df.columns]
+    total = int(usage.sum())
+    rows.append(("frame", "", total))
+    for name, obj in parts.items():
+        nbytes = getattr(obj, "nbytes", None)          # method (index), attribute (cache, array)
+        nbytes = int(nbytes() if callable(nbytes) else sizeof(obj) if nbytes is None else nbytes)
+        rows.append((name, type(obj).__name__, nbytes))
+        total += nbytes
+    rows.append(("total", "", total))
+    n = max(len(df), 1)
+    return [{"part": p, "dtype": d, "mb": round(b / 2**20, 2), "bytes_per_row": round(b / n, 1)}
+            for p, d, b in rows]
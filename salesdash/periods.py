@@ -0,0 +1,115 @@
+"""Period-over-period KPI deltas from monthly prefix sums.
+
+For a filter slice (every filter except Year and the Order Date range, which
+define the period) the cube is rolled up once to monthly totals over the full
+month axis and accumulated. The totals of any month window, and of the
+equal-length window right before it, are then two subtractions each. A date
+range that does not cover whole months is compared day for day instead, from
+the cube cells of the range and of the one before it.
+"""
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+PERIOD_MEASURES = ["Sales", "Revenue", "Profit", "Orders"]
+
+
+def prefix_sums(cells):
+    """``{"months": [...], "cum": array}`` with a leading zero row, shape (months + 1, measures)."""
+    # Month is categorical over the whole dataset, so empty months still get a row
+    monthly = cells.groupby("Month", observed=False)[PERIOD_MEASURES].sum()
+    cum = np.zeros((len(monthly) + 1, len(PERIOD_MEASURES)))
+    np.cumsum(monthly.to_numpy(dtype="float64"), axis=0, out=cum[1:])
+    return {"months": [str(m) for m in monthly.index], "cum": cum}
+
+
+def _with_margin(totals):
+    totals["Margin"] = totals["Profit"] / totals["Revenue"] * 100 if totals["Revenue"] > 0 else 0.0
+    return totals
+
+
+def window_totals(prefix, lo, hi):
+    """Summed measures for months ``[lo, hi)``."""
+    return _with_margin(dict(zip(PERIOD_MEASURES, prefix["cum"][hi] - prefix["cum"][lo])))
+
+
+def cell_totals(cells):
+    """Summed measures of any set of cube cells (same shape as :func:`window_totals`)."""
+    return _with_margin({m: float(cells[m].sum()) for m in PERIOD_MEASURES})
+
+
+def selection_span(years=None, date_range=None):
+    """Inclusive ``(start, end)`` of the selected period, or ``None`` if it is not one span.
+
+    The date range is intersected with each run of consecutive selected years
+    first, so years 2022 + 2024 with a March 2024 range are still one span.
+    """
+    bounds = None
+    if date_range is not None:
+        bounds = tuple(pd.Timestamp(t).normalize() for t in date_range)
+    if years is None:
+        return bounds if bounds is not None and bounds[0] <= bounds[1] else None
+    years = sorted({int(y) for y in (years if isinstance(years, (list, tuple, set, frozenset)) else [years])})
+    runs = []
+    for y in years:
+        if runs and runs[-1][1] == y - 1:
+            runs[-1][1] = y
+        else:
+            runs.append([y, y])
+    pieces = []
+    for first, last in runs:
+        start, end = pd.Timestamp(first, 1, 1), pd.Timestamp(last, 12, 31)
+        if bounds is not None:
+            start, end = max(start, bounds[0]), min(end, bounds[1])
+        if start <= end:
+            pieces.append((start, end))
+    return pieces[0] if len(pieces) == 1 else None
+
+
+def month_window(prefix, months):
+    """Month index range ``[lo, hi)`` spanning the ``"YYYY-MM"`` labels ``months``."""
+    return bisect_left(prefix["months"], months[0]), bisect_right(prefix["months"], months[-1])
+
+
+def previous_span(span):
+    """The equal-length date range ending the day before ``span`` starts."""
+    start, end = span
+    width = end - start + pd.Timedelta(days=1)
+    return start - width, start - pd.Timedelta(days=1)
+
+
+def compare(prefix, lo, hi):
+    """Current and previous-window totals plus a label for the previous window.
+
+    ``previous`` is ``None`` when the data does not reach back a full window.
+    """
+    width = hi - lo
+    current = window_totals(prefix, lo, hi)
+    if width <= 0 or lo - width < 0:
+        return current, None, None
+    months = prefix["months"]
+    p_lo, p_hi = lo - width, lo
+    first, last = months[p_lo], months[p_hi - 1]
+    # name calendar years plainly, anything else by its month span
+    if first[:4] == last[:4] and first.endswith("-01") and last.endswith("-12"):
+        label = first[:4]
+    elif first == last:
+        label = first
+    else:
+        label = f"{first} – {last}"
+    return current, window_totals(prefix, p_lo, p_hi), label
+
+
+def delta(current, previous, measure):
+    """``(text, direction)`` for a KPI card; margin moves in percentage points."""
+    if previous is None:
+        return "no prior period", "flat"
+    cur, prev = current[measure], previous[measure]
+    if measure == "Margin":
+        change, unit = cur - prev, " pp"
+    elif prev:
+        change, unit = (cur - prev) / abs(prev) * 100, "%"
+    else:
+        return "new vs prior period", "flat"
+    return f"{change:+.1f}{unit}", "up" if change >= 0 else "down"
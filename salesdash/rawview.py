@@ -0,0 +1,80 @@
+"""Paginated, server-side sorted view over the raw orders.
+
+A sortable column gets its stable argsort and rank array (its inverse) the
+first time it is sorted on, about 8 bytes per row each; Order Date needs
+neither while the frame is stored in date order, as positions already are
+ranks. Sorting a filtered selection then only compares integer ranks, and
+when the requested page is near the top a partial ``argpartition`` replaces
+the full sort. Only the rows of the visible page are gathered and formatted.
+"""
+import numpy as np
+import pandas as pd
+
+from salesdash.schema import DATE, widen
+
+SHOW_COLS = ["Order Date","Category","Sub-Category","Region","Segment","Product","Sales","Revenue","Profit","Quantity"]
+
+
+class RawSorter:
+    def __init__(self, df, columns=SHOW_COLS):
+        self.df = df
+        self.columns = list(columns)
+        self._orders = {}
+        self._ranks  = {}
+        # date-ordered storage (ingest.normalize): a row's position is its Order Date rank
+        self._presorted = {DATE} if DATE in df and df[DATE].is_monotonic_increasing else set()
+
+    def nbytes(self):
+        """Bytes held by the cached sort orders and rank arrays."""
+        return sum(a.nbytes for a in (*self._orders.values(), *self._ranks.values()))
+
+    def order(self, col):
+        """Row positions of the whole frame sorted ascending by ``col`` (cached)."""
+        if col not in self._orders:
+            values = self.df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # sort by label, not by category code
+                values = values.cat.reorder_categories(sorted(values.cat.categories)).cat.codes
+            dtype = np.int32 if len(values) < 2**31 else np.int64
+            self._orders[col] = np.argsort(values.to_numpy(), kind="stable").astype(dtype, copy=False)
+        return self._orders[col]
+
+    def rank(self, col):
+        if col not in self._ranks:
+            order = self.order(col)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order), dtype=order.dtype)
+            self._ranks[col] = rank
+        return self._ranks[col]
+
+    def page_rows(self, rows, col, ascending=True, page=0, page_size=50):
+        """Row positions for one page of ``rows`` (``None`` = all rows) sorted by ``col``."""
+        lo, hi = page * page_size, (page + 1) * page_size
+        presorted = col in self._presorted
+        if rows is None:
+            n = len(self.df)
+            if presorted:
+                return np.arange(lo, min(hi, n)) if ascending else np.arange(n - 1 - lo, max(n - 1 - hi, -1), -1)
+            order = self.order(col)
+            return order[lo:hi] if ascending else order[::-1][lo:hi]
+
+        keys = rows if presorted else self.rank(col)[rows]
+        if not ascending:
+            keys = -keys.astype(np.int64)
+        hi = min(hi, len(keys))
+        if lo >= hi:
+            return rows[:0]
+        if hi < len(keys) // 4:
+            # partial top-k: only the first ``hi`` ranks need to be ordered
+            top = np.argpartition(keys, hi - 1)[:hi]
+            top = top[np.argsort(keys[top], kind="stable")]
+        else:
+            top = np.argsort(keys, kind="stable")[:hi]
+        return rows[top[lo:hi]]
+
+    def page(self, rows, col, ascending=True, page=0, page_size=50, date_format="%d %b %Y"):
+        """The formatted frame for one page."""
+        out = widen(self.df.iloc[self.page_rows(rows, col, ascending, page, page_size)][self.columns].copy())
+        if DATE in out:
+            out[DATE] = out[DATE].dt.strftime(date_format)
+        return out
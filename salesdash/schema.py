@@ -0,0 +1,95 @@
+"""Column layout shared by the generator, the loaders and the dashboard."""
+import numpy as np
+import pandas as pd
+
+# ─── COLUMNS ──────────────────────────────────────────────────────────────────
+DATE       = "Order Date"
+CUSTOMER   = "Customer ID"
+DIMENSIONS = ["Region", "Category", "Segment", "Product", "Sub-Category"]
+MEASURES   = ["Sales", "Quantity", "Profit"]
+OPTIONAL   = ["Discount", "Revenue", CUSTOMER]
+DERIVED    = ["Year", "Month", "MonthName", "Revenue"]
+
+REQUIRED = [DATE] + DIMENSIONS + MEASURES
+COLUMNS  = REQUIRED + OPTIONAL
+
+
+def month_range(dates):
+    return pd.period_range(dates.min(), dates.max(), freq="M")
+
+
+def month_columns(dates, months=None):
+    """Return ``(Month, MonthName)`` categoricals for a datetime column.
+
+    Labels are built once per calendar month rather than once per row.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if months is None:
+        months = month_range(dates) if len(dates) else pd.PeriodIndex([], freq="M")
+    if len(months):
+        idx = np.asarray((dates.year - months[0].year) * 12 + dates.month - months[0].month)
+    else:
+        idx = np.zeros(0, dtype="int64")
+    month = pd.Categorical.from_codes(idx, categories=[str(p) for p in months])
+    name  = pd.Categorical.from_codes(idx, categories=[p.strftime("%b %Y") for p in months])
+    return month, name
+
+
+def add_derived(df, months=None):
+    """Add Year / Month / MonthName (and Revenue if absent) in place."""
+    dates = df[DATE].dt
+    if "Revenue" not in df:
+        df["Revenue"] = (df["Sales"] * df["Quantity"]).round(2)
+    df["Year"] = dates.year.astype("int64")
+    df["Month"], df["MonthName"] = month_columns(df[DATE], months)
+    return df
+
+
+# ─── COMPACT STORAGE ──────────────────────────────────────────────────────────
+# measures kept to this many decimals; stored as float32 only when that round-trips exactly
+FLOAT32_DECIMALS = {"Sales": 2, "Profit": 2, "Revenue": 2, "Discount": 4}
+
+
+def column(df, name):
+    """``df[name]``; Year / Month / MonthName are derived from the date when not stored."""
+    if name in df:
+        return df[name]
+    if name == "Year":
+        return pd.Series(df[DATE].dt.year.to_numpy("int64"), index=df.index, name=name)
+    if name in ("Month", "MonthName"):
+        month, month_name = month_columns(df[DATE])
+        return pd.Series(month if name == "Month" else month_name, index=df.index, name=name)
+    raise KeyError(name)
+
+
+def _fits_float32(values, decimals):
+    return np.array_equal(values.astype("float32").astype("float64").round(decimals), values, equal_nan=True)
+
+
+def compact(df):
+    """Narrow copy of ``df``: float32 measures where exact, smallest integers, categorical ids,
+    and no stored time labels (:func:`column` derives them from the date on demand)."""
+    out = df.drop(columns=[c for c in ("Year", "Month", "MonthName") if c in df])
+    for col, decimals in FLOAT32_DECIMALS.items():
+        if col in out and out[col].dtype == "float64" and _fits_float32(out[col].to_numpy(), decimals):
+            out[col] = out[col].astype("float32")
+    for col in out.columns:
+        values = out[col]
+        if pd.api.types.is_integer_dtype(values.dtype):
+            out[col] = pd.to_numeric(values, downcast="integer")
+        elif values.dtype == object:
+            out[col] = values.astype("category")
+    return out
+
+
+def widen(frame):
+    """Undo :func:`compact`'s narrowing: float32 measures back to float64 at their stored
+    precision and narrow integers to int64, so sums, display and exports match."""
+    cols = {}
+    for c in frame.columns:
+        dtype = frame[c].dtype
+        if c in FLOAT32_DECIMALS and dtype == "float32":
+            cols[c] = frame[c].astype("float64").round(FLOAT32_DECIMALS[c])
+        elif pd.api.types.is_signed_integer_dtype(dtype) and dtype.itemsize < 8:
+            cols[c] = frame[c].astype("int64")
+    return frame.assign(**cols) if cols else frame
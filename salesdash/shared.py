@@ -0,0 +1,159 @@
+"""Publish-once, map-everywhere dataset for multi-process deployments.
+
+With several Streamlit server processes behind a load balancer, the first one
+to reach a dataset version loads it and writes every column (categoricals as
+codes) and the filter-index posting lists as plain ``.npy`` files. The other
+workers ``np.load(..., mmap_mode="r")`` them: the frame and the index are
+read-only views over the OS page cache, so pages are shared instead of each
+worker holding a private copy, and attaching costs a manifest read.
+
+A version is written to a temporary directory and renamed into place, so a
+reader never sees a half-written one; an advisory lock keeps the other
+workers waiting instead of loading the same data in parallel. Every attach
+touches the version's manifest, and versions nobody attached for
+:data:`PRUNE_GRACE` seconds are removed, so workers of a rolling deploy
+don't delete each other's data. Workers still mapping a removed version keep
+their pages (POSIX unlink semantics), and an attach that loses the race
+with a prune publishes the version again.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from salesdash.index import FilterIndex
+from salesdash.schema import DATE
+
+try:
+    import fcntl
+except ImportError:        # no advisory locks: racing workers each build, one rename wins
+    fcntl = None
+
+MANIFEST = "manifest.json"
+PRUNE_GRACE = 3600      # seconds since a version was last attached before it may be removed
+
+
+@contextmanager
+def _locked(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _save(path, name, array):
+    np.save(os.path.join(path, name), np.ascontiguousarray(array), allow_pickle=False)
+    return name
+
+
+def write(path, df, index, version):
+    """Write ``df`` and ``index`` as ``.npy`` columns plus a manifest under ``path``."""
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        spec = {"name": col}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            spec["categories"] = values.cat.categories.tolist()
+            values = values.cat.codes
+        spec["file"] = _save(path, f"col{i}.npy", values.to_numpy())
+        columns.append(spec)
+
+    postings = {}
+    for i, (col, posting) in enumerate(index.postings.items()):
+        # one array per column; each value owns the slice [bounds[j], bounds[j + 1])
+        parts = list(posting.values())
+        bounds = np.concatenate([[0], np.cumsum([len(p) for p in parts])]).tolist()
+        postings[col] = {
+            "values": list(posting),
+            "bounds": bounds,
+            "file":   _save(path, f"idx{i}.npy", np.concatenate(parts) if parts else np.zeros(0, np.int32)),
+        }
+
+    manifest = {"version": version, "rows": len(df), "columns": columns, "postings": postings}
+    with open(os.path.join(path, MANIFEST), "w") as f:
+        json.dump(manifest, f, default=int)
+
+
+def attach(path):
+    """Map a published dataset read-only: ``(df, index)`` backed by the files under ``path``."""
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    load = lambda name: np.load(os.path.join(path, name), mmap_mode="r")
+
+    data = {}
+    for spec in manifest["columns"]:
+        values = load(spec["file"])
+        if "categories" in spec:
+            values = pd.Categorical.from_codes(values, categories=spec["categories"])
+        data[spec["name"]] = values
+    df = pd.DataFrame(data, copy=False)
+
+    postings = {}
+    for col, spec in manifest["postings"].items():
+        rows, bounds = load(spec["file"]), spec["bounds"]
+        postings[col] = {v: rows[bounds[j]:bounds[j + 1]] for j, v in enumerate(spec["values"])}
+    dates = df[DATE].to_numpy() if DATE in df else None
+    return df, FilterIndex.from_postings(manifest["rows"], postings, dates)
+
+
+def prune(root, keep, grace=PRUNE_GRACE):
+    """Remove the published versions under ``root`` other than ``keep`` that nobody attached
+    in the last ``grace`` seconds."""
+    cutoff = time.time() - grace
+    for name in os.listdir(root):
+        manifest = os.path.join(root, name, MANIFEST)
+        # dot-prefixed entries are locks and in-progress writes
+        if name == keep or name.startswith("."):
+            continue
+        try:
+            if os.stat(manifest).st_mtime < cutoff:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        except FileNotFoundError:
+            pass
+
+
+def _publish(root, version, loader):
+    target = os.path.join(root, version)
+    os.makedirs(root, exist_ok=True)
+    with _locked(os.path.join(root, f".{version}.lock")):
+        if not os.path.exists(os.path.join(target, MANIFEST)):
+            df = loader()
+            tmp = tempfile.mkdtemp(prefix=f".{version}.", dir=root)
+            try:
+                write(tmp, df, FilterIndex(df), version)
+                os.rename(tmp, target)
+            except OSError:
+                # another worker renamed its copy into place first
+                if not os.path.exists(os.path.join(target, MANIFEST)):
+                    raise
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_or_publish(root, version, loader, attempts=3):
+    """Attach ``root/version``, publishing it first from ``loader()`` if no worker has yet."""
+    target = os.path.join(root, version)
+    for attempt in range(attempts):
+        if not os.path.exists(os.path.join(target, MANIFEST)):
+            _publish(root, version, loader)
+        try:
+            # the manifest's mtime records the last attach: it keeps this version from being pruned
+            os.utime(os.path.join(target, MANIFEST))
+            shared = attach(target)
+            break
+        except FileNotFoundError:
+            # pruned between the check and the attach: publish it again
+            if attempt == attempts - 1:
+                raise
+    prune(root, version)
+    return shared
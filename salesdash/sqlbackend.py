@@ -0,0 +1,210 @@
+"""Out-of-core execution backend: SQL pushed down to DuckDB over Parquet.
+
+The orders never enter pandas. DuckDB scans the Parquet (or CSV) files in
+place, the sidebar filters become a ``WHERE`` clause (Year and the Order Date
+range as date comparisons so row groups can be skipped from their statistics,
+multi-selects as ``IN`` lists) and every aggregation runs
+in the engine. Only small result sets come back: one GROUP BY per chart and
+per KPI / period total (never the product-grain cube, which grows with the
+catalogue), a fine-grained time series, or one page of raw rows.
+
+Needs the optional ``duckdb`` package.
+"""
+import glob
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from salesdash.cube import FILTERS, VIEWS, kpis
+from salesdash.ingest import source_version
+from salesdash.periods import PERIOD_MEASURES
+from salesdash.rawview import SHOW_COLS
+from salesdash.export import CHUNK_ROWS
+from salesdash.schema import COLUMNS, CUSTOMER, DATE, DIMENSIONS, REQUIRED
+from salesdash.timeseries import GRANULARITIES
+from salesdash.topk import HyperLogLog
+
+
+def _ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+class DuckDBBackend:
+    def __init__(self, source, memory_limit="", threads=0):
+        import duckdb
+
+        self.source = source
+        if not self.files():
+            raise ValueError(f"no Parquet/CSV files match {source!r}")
+        self._con = duckdb.connect()
+        if memory_limit:
+            self._con.execute(f"SET memory_limit = {_literal(memory_limit)}")
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        self._con.execute(f"CREATE VIEW orders AS {self._select()}")
+        self.columns = [row[0] for row in self._con.execute("DESCRIBE orders").fetchall()]
+
+    def files(self):
+        return sorted(glob.glob(self.source))
+
+    def version(self):
+        """Changes whenever a file matching the source glob is added, replaced or removed."""
+        key = ",".join(source_version(f) for f in self.files())
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def _select(self):
+        # the glob is re-expanded on every scan, so newly dropped files are picked up
+        lower = self.source.lower()
+        reader = "read_csv_auto" if lower.endswith((".csv", ".csv.gz", ".txt")) else "read_parquet"
+        scan = f"{reader}({_literal(self.source)})"
+        present = {row[0] for row in self._con.execute(f"DESCRIBE SELECT * FROM {scan}").fetchall()}
+        # file + row position: a unique, deterministic tiebreaker for paging (Parquet only)
+        self._row_keys = [] if reader == "read_csv_auto" else ["_file", "_row"]
+        if self._row_keys:
+            scan = f"read_parquet({_literal(self.source)}, filename = true, file_row_number = true)"
+        missing = [c for c in REQUIRED if c not in present]
+        if missing:
+            raise ValueError(f"source is missing required columns: {', '.join(missing)}")
+        revenue = ('"Revenue"' if "Revenue" in present
+                   else 'ROUND("Sales" * "Quantity", 2)')
+        date = f'CAST({_ident(DATE)} AS TIMESTAMP)'
+        cols = ", ".join(_ident(c) for c in DIMENSIONS + ["Sales", "Quantity", "Profit"]
+                         + [CUSTOMER] * (CUSTOMER in present))
+        keys = ", filename AS _file, file_row_number AS _row" if self._row_keys else ""
+        return (f"SELECT {date} AS {_ident(DATE)}, {cols}, {revenue} AS \"Revenue\", "
+                f"CAST(year({date}) AS BIGINT) AS \"Year\", strftime({date}, '%Y-%m') AS \"Month\"{keys} "
+                f"FROM {scan}")
+
+    def _query(self, sql, params=()):
+        # a cursor per query: the shared connection is not safe across threads
+        with self._con.cursor() as cur:
+            return cur.execute(sql, list(params)).df()
+
+    def _where(self, filters):
+        clauses, params = [], []
+        for col, value in filters.items():
+            values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            if col == DATE:
+                # inclusive (start, end) dates
+                start, end = (pd.Timestamp(t).normalize() for t in value)
+                clauses.append(f"({_ident(DATE)} >= ? AND {_ident(DATE)} < ?)")
+                params += [start, end + pd.Timedelta(days=1)]
+            elif not values:
+                clauses.append("FALSE")
+            elif col == "Year":
+                # a date range instead of year(): prunes row groups by their min/max stats
+                ranges = [f"({_ident(DATE)} >= ? AND {_ident(DATE)} < ?)" for _ in values]
+                clauses.append("(" + " OR ".join(ranges) + ")")
+                for y in values:
+                    params += [pd.Timestamp(int(y), 1, 1), pd.Timestamp(int(y) + 1, 1, 1)]
+            else:
+                clauses.append(f"{_ident(col)} IN ({', '.join('?' * len(values))})")
+                params += [str(v) for v in values]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    # ─── RESULT SETS ──────────────────────────────────────────────────────────
+    def count(self):
+        return int(self._query("SELECT COUNT(*) AS n FROM orders")["n"].iloc[0])
+
+    def filter_options(self):
+        """:func:`salesdash.cube.filter_options` computed in the engine."""
+        options = {col: self._query(f"SELECT DISTINCT {_ident(col)} AS v FROM orders ORDER BY 1")["v"].tolist()
+                   for col in FILTERS}
+        span = self._query('SELECT MIN("Month") AS lo, MAX("Month") AS hi, COUNT(*) AS n FROM orders').iloc[0]
+        options["Month"] = ([str(p) for p in pd.period_range(span["lo"], span["hi"], freq="M")]
+                            if span["n"] else [])
+        options["rows"] = int(span["n"])
+        return options
+
+    def rollup(self, filters, by, measures):
+        """:func:`salesdash.cube.rollup` of the filtered rows; ``"Orders"`` counts them."""
+        aggs = ", ".join(
+            'COUNT(*) AS "Orders"' if m == "Orders" else
+            f"CAST(COALESCE(SUM({_ident(m)}), 0) AS {'BIGINT' if m == 'Quantity' else 'DOUBLE'}) AS {_ident(m)}"
+            for m in measures)
+        where, params = self._where(filters)
+        dims = ", ".join(_ident(c) for c in by)
+        group = f" GROUP BY {dims} ORDER BY {dims}" if by else ""
+        return self._query(f"SELECT {dims + ', ' if by else ''}{aggs} FROM orders{where}{group}", params)
+
+    def view(self, filters, names=None):
+        """:func:`salesdash.cube.compute_view` with one small GROUP BY per chart in the engine."""
+        view = {name: self.rollup(filters, *VIEWS[name]) for name in (names or VIEWS)}
+        view["kpis"] = kpis(self.rollup(filters, [], ["Sales", "Revenue", "Profit", "Orders"]))
+        return view
+
+    def monthly(self, filters, months):
+        """Per-month :data:`~salesdash.periods.PERIOD_MEASURES` over the full month axis ``months``,
+        shaped for :func:`salesdash.periods.prefix_sums`."""
+        cells = self.rollup(filters, ["Month"], PERIOD_MEASURES)
+        cells["Month"] = pd.Categorical(cells["Month"], categories=months)
+        return cells
+
+    def series(self, filters, granularity):
+        """:func:`salesdash.timeseries.series_view` for a non-monthly granularity, bucketed in SQL."""
+        width, offset = (v // 1000 for v in GRANULARITIES[granularity])  # ns → µs
+        where, params = self._where(filters)
+        t = _ident(granularity)
+        frame = self._query(
+            f"SELECT make_timestamp((epoch_us({_ident(DATE)}) - {offset}) // {width} * {width} + {offset}) AS {t}, "
+            f'"Category", SUM("Revenue") AS "Revenue", SUM("Sales") AS "Sales" '
+            f"FROM orders{where} GROUP BY ALL ORDER BY 1, 2", params)
+        frame[granularity] = frame[granularity].astype("datetime64[ns]")
+        return {
+            "monthly":        frame.groupby(granularity, sort=True)[["Revenue", "Sales"]].sum().reset_index(),
+            "month_category": frame[[granularity, "Category", "Sales"]],
+        }
+
+    def distinct(self, filters, col):
+        """Exact number of distinct ``col`` values among the filtered rows."""
+        where, params = self._where(filters)
+        return int(self._query(f"SELECT COUNT(DISTINCT {_ident(col)}) AS n FROM orders{where}", params)["n"].iloc[0])
+
+    def hyperloglog(self, filters, col, p=14):
+        """:class:`salesdash.topk.HyperLogLog` of ``col`` with the registers reduced in the engine.
+
+        Only the smallest low-bits hash per register (the one setting its rank)
+        comes back: at most ``2**p`` rows whatever the row count.
+        """
+        bits = 64 - p
+        where, params = self._where(filters)
+        h = f"hash({_ident(col)})"
+        frame = self._query(f"SELECT {h} >> {bits} AS idx, MIN({h} & {(1 << bits) - 1}::UBIGINT) AS rest "
+                            f"FROM orders{where} GROUP BY 1", params)
+        hashes = (frame["idx"].to_numpy("uint64") << np.uint64(bits)) | frame["rest"].to_numpy("uint64")
+        return HyperLogLog(p).add_hashes(hashes)
+
+    def chunks(self, filters, columns=None, chunk_size=CHUNK_ROWS):
+        """Every row matching ``filters`` as successive frames, streamed from the engine."""
+        where, params = self._where(filters)
+        cols = ", ".join(_ident(c) for c in (columns or [c for c in COLUMNS if c in self.columns]))
+        with self._con.cursor() as cur:
+            reader = cur.execute(f"SELECT {cols} FROM orders{where}", params).fetch_record_batch(chunk_size)
+            empty = True
+            for batch in reader:
+                empty = False
+                yield batch.to_pandas()
+            if empty:
+                yield reader.schema.empty_table().to_pandas()
+
+    def page(self, filters, col, ascending=True, page=0, page_size=50, date_format="%d %b %Y"):
+        """One formatted page of raw rows, sorted and sliced in the engine.
+
+        Ties on ``col`` are broken by file and row position (CSV: by the other
+        shown columns), so consecutive pages never overlap or skip rows.
+        """
+        where, params = self._where(filters)
+        ties = self._row_keys or [c for c in SHOW_COLS if c != col]
+        order = ", ".join([f"{_ident(col)} {'ASC' if ascending else 'DESC'}"] + [_ident(c) for c in ties])
+        out = self._query(
+            f"SELECT {', '.join(_ident(c) for c in SHOW_COLS)} FROM orders{where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [page_size, page * page_size])
+        if DATE in out:
+            out[DATE] = out[DATE].dt.strftime(date_format)
+        return out
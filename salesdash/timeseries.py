@@ -0,0 +1,108 @@
+"""Server-side resampling and downsampling for the time-series charts.
+
+Monthly series come straight from the cube. Finer grains are bucketed from
+the filtered rows with integer arithmetic on the timestamps, and any series
+longer than the point budget is thinned with LTTB (shape-preserving) or
+min-max (extreme-preserving) before it is handed to Plotly.
+"""
+import numpy as np
+import pandas as pd
+
+from salesdash.schema import DATE, widen
+
+DAY  = 86_400 * 10**9
+HOUR = 3_600 * 10**9
+
+# granularity → (bucket width, offset) in ns; weeks start on Monday (epoch + 4 days)
+GRANULARITIES = {
+    "Month": None,
+    "Week":  (7 * DAY, 4 * DAY),
+    "Day":   (DAY, 0),
+    "Hour":  (HOUR, 0),
+}
+
+
+def bucket(dates, granularity):
+    """Floor timestamps to the start of their ``granularity`` bucket."""
+    if GRANULARITIES[granularity] is None:
+        return pd.DatetimeIndex(dates).to_period("M").to_timestamp()
+    width, offset = GRANULARITIES[granularity]
+    ns = np.asarray(dates, dtype="datetime64[ns]").view("int64")
+    return pd.DatetimeIndex(((ns - offset) // width * width + offset).view("datetime64[ns]"))
+
+
+def resample(rows, granularity, measures, by=None):
+    """Sum ``measures`` per time bucket (and per ``by`` column) into a tidy frame."""
+    keys = [pd.Series(bucket(rows[DATE], granularity), index=rows.index, name=granularity)]
+    if by:
+        keys.append(rows[by])
+    return widen(rows[measures]).groupby(keys, observed=True).sum().reset_index()
+
+
+def series_view(rows, granularity):
+    """Fine-grained replacements for the cube's ``monthly`` / ``month_category`` views.
+
+    One pass over the rows: both measures are summed per (bucket, Category)
+    and the per-bucket totals are rolled up from that much smaller frame.
+    """
+    by_cat  = resample(rows, granularity, ["Revenue", "Sales"], by="Category")
+    monthly = by_cat.groupby(granularity, sort=True)[["Revenue", "Sales"]].sum().reset_index()
+    return {"monthly": monthly, "month_category": by_cat[[granularity, "Category", "Sales"]]}
+
+
+# ─── DOWNSAMPLING ─────────────────────────────────────────────────────────────
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of ``n_out`` visually representative points."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket is the third triangle vertex
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax(x, y, n_out):
+    """Indices of the min and max point in each of ``n_out // 2`` equal buckets."""
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+    y = np.asarray(y, dtype="float64")
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = y[lo:hi]
+            keep.extend((lo + int(seg.argmin()), lo + int(seg.argmax())))
+    return np.unique(keep)
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+
+def thin(frame, x, y, max_points, method="lttb", by=None):
+    """Rows of ``frame`` (sorted by ``x``) thinned to ``max_points`` per ``by`` group."""
+    groups = [frame] if by is None else [g for _, g in frame.groupby(by, observed=True, sort=False)]
+    parts = []
+    for g in groups:
+        if len(g) <= max_points:
+            parts.append(g)
+            continue
+        xs = np.asarray(g[x])
+        if np.issubdtype(xs.dtype, np.datetime64):
+            xs = xs.astype("datetime64[ns]").view("int64")
+        parts.append(g.iloc[DOWNSAMPLERS[method](xs, g[y].to_numpy(), max_points)])
+    if len(parts) <= 1:
+        return parts[0] if parts else frame
+    return pd.concat(parts)
@@ -0,0 +1,147 @@
+"""Top-k selection and streaming sketches for ranking and distinct-count panels.
+
+Exact top-k uses a linear-time partial selection (``argpartition``) and only
+sorts the k winners. For catalogues too large to aggregate exactly, the
+filtered rows can instead be streamed once through bounded-memory sketches:
+
+* :class:`SpaceSaving` keeps ``capacity`` weighted counters (heavy hitters);
+  every reported total overestimates the true one by at most its ``Error``,
+  and no error exceeds ``total / capacity``.
+* :class:`HyperLogLog` estimates distinct counts (e.g. customers) from
+  ``2**p`` one-byte registers with ~``1.04 / sqrt(2**p)`` relative error.
+
+Both sketches merge, so per-chunk or per-worker sketches can be combined.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+def top_k(frame, by, k):
+    """The ``k`` rows of ``frame`` with the largest ``by``, in descending order."""
+    values = frame[by].to_numpy()
+    if len(values) > k:
+        idx = np.argpartition(-values, k - 1)[:k]
+    else:
+        idx = np.arange(len(values))
+    return frame.iloc[idx[np.argsort(-values[idx], kind="stable")]]
+
+
+# ─── HEAVY HITTERS ────────────────────────────────────────────────────────────
+class SpaceSaving:
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.total  = 0.0
+        self.counts = {}
+        self.errors = {}
+        self._heap  = []       # (count, item); stale entries are skipped lazily
+
+    def _min(self):
+        while True:
+            count, item = self._heap[0]
+            if self.counts.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+
+    def _set(self, item, count):
+        self.counts[item] = count
+        heapq.heappush(self._heap, (count, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, items, weights=None):
+        """Add a batch of ``items`` (with non-negative ``weights``, default 1 each)."""
+        weights = np.ones(len(items)) if weights is None else np.asarray(weights, dtype="float64")
+        # one counter update per distinct item of the batch
+        keys  = items.array if isinstance(items, pd.Series) else np.asarray(items)   # categoricals stay coded
+        batch = pd.Series(weights).groupby(keys, sort=False, observed=True).sum()
+        for item, w in zip(batch.index.tolist(), batch.tolist()):
+            self.total += w
+            if item in self.counts:
+                self._set(item, self.counts[item] + w)
+            elif len(self.counts) < self.capacity:
+                self.errors[item] = 0.0
+                self._set(item, w)
+            else:
+                # evict the smallest counter; the newcomer inherits it as its error bound
+                floor, victim = self._min()
+                del self.counts[victim], self.errors[victim]
+                self.errors[item] = floor
+                self._set(item, floor + w)
+        return self
+
+    def merge(self, other):
+        for item, count in other.counts.items():
+            self.update([item], [count])
+            self.errors[item] = self.errors.get(item, 0.0) + other.errors[item]
+        return self
+
+    def top(self, k, name="item", value="count"):
+        """``[name, value, "Error", "Guaranteed"]`` for the ``k`` largest counters.
+
+        ``Guaranteed`` rows are certainly in the true top ``k``: even their
+        lower bound beats the next counter's upper bound.
+        """
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        cutoff = ranked[k][1] if len(ranked) > k else 0.0
+        rows = [(item, count, self.errors[item], count - self.errors[item] >= cutoff)
+                for item, count in ranked[:k]]
+        return pd.DataFrame(rows, columns=[name, value, "Error", "Guaranteed"])
+
+    def max_error(self):
+        return max(self.errors.values(), default=0.0)
+
+
+# ─── DISTINCT COUNTS ──────────────────────────────────────────────────────────
+_POW2 = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+
+
+class HyperLogLog:
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(self.m)
+
+    def add(self, values):
+        return self.add_hashes(pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy())
+
+    def add_hashes(self, h):
+        """Add 64-bit hashes directly (e.g. computed by a database engine)."""
+        h = np.asarray(h, dtype=np.uint64)
+        bits = 64 - self.p
+        idx  = (h >> np.uint64(bits)).astype(np.intp)
+        rest = h & np.uint64((1 << bits) - 1)
+        # rank = 1-based position of the leftmost set bit in the low ``bits`` bits
+        rank = bits + 1 - np.searchsorted(_POW2, rest, side="right")
+        np.maximum.at(self.registers, idx, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.exp2(-self.registers.astype("float64")).sum()
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)    # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+def sketch(chunks, key, weight, distinct=None, capacity=1024, p=14):
+    """One pass over ``chunks``: SpaceSaving of ``key`` by ``weight``, HyperLogLog of ``distinct``."""
+    heavy = SpaceSaving(capacity)
+    hll   = HyperLogLog(p) if distinct else None
+    for chunk in chunks:
+        heavy.update(chunk[key], chunk[weight])
+        if hll is not None:
+            hll.add(chunk[distinct])
+    return heavy, hll
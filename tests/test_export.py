@@ -0,0 +1,29 @@
+import io
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from salesdash import export
+from salesdash.datagen import generate_frame
+from salesdash.index import FilterIndex
+
+download_data_util = pytest.importorskip("streamlit.runtime.download_data_util")
+
+
+@pytest.mark.parametrize("export_fmt", list(export.FORMATS))
+def test_selection_file_is_a_valid_deferred_download(export_fmt):
+    df = generate_frame(2_500, seed=7)
+    filters = {"Region": ["East", "West"]}
+    # exactly what the raw-data download button is handed
+    data = partial(export.selection_file, df, FilterIndex(df), None, filters, export_fmt)
+
+    raw, _ = download_data_util.convert_data_to_bytes_and_infer_mime(data(), TypeError("unsupported"))
+
+    expected = int(df["Region"].isin(filters["Region"]).sum())
+    if export_fmt == "Parquet":
+        out = pd.read_parquet(io.BytesIO(raw))
+    else:
+        out = pd.read_csv(io.BytesIO(raw), compression="gzip" if export_fmt == "CSV (gzip)" else None)
+    assert len(out) == expected
+    assert list(out.columns) == export.export_columns(df)